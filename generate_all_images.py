@@ -11,6 +11,7 @@
 - Логує процес генерації
 """
 
+import argparse
 import asyncio
 import sys
 import os
@@ -18,6 +19,7 @@ import json
 from pathlib import Path
 from datetime import datetime
 from zoneinfo import ZoneInfo
+from typing import Optional
 
 # Додаємо src в шлях для імпорту
 sys.path.insert(0, str(Path(__file__).parent))
@@ -35,16 +37,48 @@ def find_latest_json():
     
     return str(json_path)
 
-async def generate_all_themes(json_path: str):
+def list_present_files(base_dir: Path, relative_paths: list) -> set:
+    """
+    Зібрати множину наявних файлів серед потрібних
+    
+    Кожна папка читається одним scandir замість окремого exists() на файл.
+    
+    Args:
+        base_dir: Базова папка
+        relative_paths: Відносні шляхи у форматі "css/file.css"
+        
+    Returns:
+        set: Відносні шляхи файлів, які існують
+    """
+    present = set()
+    for subdir in {os.path.dirname(p) for p in relative_paths}:
+        try:
+            with os.scandir(base_dir / subdir) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        present.add(f"{subdir}/{entry.name}" if subdir else entry.name)
+        except FileNotFoundError:
+            continue
+    return present
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Генерація всіх зображень через HTML рендерер")
+    parser.add_argument("--max-parallel", "-j", type=int, default=None,
+                        help="Кількість одночасних рендерів (за замовчуванням: PW_CONCURRENCY або 4)")
+    return parser.parse_args()
+
+async def generate_all_themes(json_path: str, max_parallel: Optional[int] = None):
     """Генерувати зображення тільки для світлої теми"""
-    renderer = HTMLRenderer(json_path)
+    renderer = HTMLRenderer(json_path, max_parallel=max_parallel)
     
     try:
         results = {}
         
-        # Тільки світла тема
-        log("☀️ Генерую зображення світлої теми...")
-        results['light'] = await renderer.generate_all_images("light")
+        # Один браузер на всі теми
+        async with renderer:
+            # Тільки світла тема
+            log("☀️ Генерую зображення світлої теми...")
+            results['light'] = await renderer.generate_all_images("light")
         
         return results
         
@@ -55,26 +89,24 @@ async def generate_all_themes(json_path: str):
 def count_generated_images(results):
     """Підрахувати кількість згенерованих зображень"""
     total = 0
+    lines = []
     
     for theme_name, theme_results in results.items():
-        theme_count = 0
-        
-        # Повні графіки
-        theme_count += len(theme_results.get('full', []))
-        
-        # Матриці груп
-        theme_count += len(theme_results.get('groups', []))
-        
-        # Індивідуальні зображення
-        for group_results in theme_results.get('individual', {}).values():
-            theme_count += len(group_results)
-            
-        log(f"   {theme_name.capitalize()}: {theme_count} зображень")
+        # Повні графіки + матриці груп + індивідуальні зображення
+        theme_count = (
+            len(theme_results.get('full', ()))
+            + len(theme_results.get('groups', ()))
+            + sum(map(len, theme_results.get('individual', {}).values()))
+        )
+        lines.append(f"   {theme_name.capitalize()}: {theme_count} зображень")
         total += theme_count
+    
+    if lines:
+        log("\n".join(lines))
         
     return total
 
-async def main():
+async def main(max_parallel: Optional[int] = None):
     """
     Основна функція для генерації всіх зображень
     
@@ -111,14 +143,9 @@ async def main():
             "js/schedule-shared.js"
         ]
         
-        missing_files = []
-        for template in required_templates:
-            if not (templates_dir / template).exists():
-                missing_files.append(template)
-                
-        for resource in required_resources:
-            if not (templates_dir / resource).exists():
-                missing_files.append(resource)
+        required_files = required_templates + required_resources
+        present_files = list_present_files(templates_dir, required_files)
+        missing_files = [f for f in required_files if f not in present_files]
                 
         if missing_files:
             log(f"❌ Відсутні файли: {', '.join(missing_files)}")
@@ -127,7 +154,7 @@ async def main():
         log("✅ Всі необхідні шаблони та ресурси знайдені")
         
         # Генеруємо зображення
-        results = await generate_all_themes(json_path)
+        results = await generate_all_themes(json_path, max_parallel)
         
         # Підраховуємо результати
         log("=" * 60)
@@ -159,4 +186,5 @@ if __name__ == "__main__":
         log("   Потім: playwright install chromium")
         sys.exit(1)
         
-    asyncio.run(main())
\ No newline at end of file
+    args = parse_args()
+    asyncio.run(main(args.max_parallel))
\ No newline at end of file
@@ -6,10 +6,29 @@
 """
 
 import os
+import ast
 import sys
-from pathlib import Path
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import subprocess
-import json
+
+# pygit2 опціональний: читає індекс Git без запуску процесу git
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+from src.logger import SCRIPT_LOG_LEVELS, setup_queue_logging
+from src.utils import dump_json
+
+# Перевірки (в т.ч. паралельні) лише додають запис у чергу,
+# а у stdout пише один фоновий потік — рядки не перемішуються
+_logger = setup_queue_logging("prepare_release")
+
+# Буфер записів логу поточного потоку (див. _run_buffered)
+_log_buffer = threading.local()
 
 def log(message, level="INFO"):
     """Логування з кольорами"""
@@ -23,11 +42,54 @@ def log(message, level="INFO"):
     
     color = colors.get(level, colors["INFO"])
     reset = colors["RESET"]
-    print(f"{color}[{level}]{reset} {message}")
+    record = (SCRIPT_LOG_LEVELS.get(level, logging.INFO), f"{color}[{level}]{reset} {message}")
+    
+    lines = getattr(_log_buffer, "lines", None)
+    if lines is not None:
+        lines.append(record)
+    else:
+        _logger.log(*record)
+
+def _run_buffered(check_func):
+    """
+    Виконати перевірку, зібравши її записи логу замість виводу
+    
+    Паралельні перевірки не перемішують рядки: main виводить буфер
+    кожної перевірки під її заголовком, у порядку перевірок.
+    
+    Returns:
+        Tuple[bool, list]: Результат перевірки та її записи (рівень, рядок)
+    """
+    lines = _log_buffer.lines = []
+    try:
+        return check_func(), lines
+    finally:
+        _log_buffer.lines = None
+
+@lru_cache(maxsize=None)
+def _list_dir(dir_path):
+    """
+    Знімок вмісту папки: ім'я -> чи це папка
+    
+    Кожна папка читається одним scandir, повторні перевірки беруться з кешу.
+    """
+    try:
+        with os.scandir(dir_path or ".") as entries:
+            return {entry.name: entry.is_dir() for entry in entries}
+    except (FileNotFoundError, NotADirectoryError):
+        return {}
+
+def path_exists(path, is_dir=False):
+    """Перевірити наявність файлу або папки через знімок батьківської папки"""
+    parent, name = os.path.split(path.rstrip("/"))
+    entries = _list_dir(parent)
+    if name not in entries:
+        return False
+    return entries[name] if is_dir else True
 
 def check_file_exists(file_path, description):
     """Перевірка існування файлу"""
-    if Path(file_path).exists():
+    if path_exists(file_path):
         log(f"✅ {description}: {file_path}", "SUCCESS")
         return True
     else:
@@ -81,7 +143,7 @@ def check_directory_structure():
     
     # Перевірка папок
     for dir_path, description in required_dirs:
-        if not Path(dir_path).is_dir():
+        if not path_exists(dir_path, is_dir=True):
             log(f"❌ {description} не знайдено: {dir_path}", "ERROR")
             all_good = False
         else:
@@ -94,6 +156,23 @@ def check_directory_structure():
     
     return all_good
 
+def _syntax_error(file_path):
+    """
+    Перевірити синтаксис одного файлу
+    
+    Файл завжди розбирається заново: свіжий .pyc поруч не доводить, що
+    компілювалась саме поточна версія (копіювання зі збереженням mtime).
+    
+    Returns:
+        Optional[SyntaxError]: None якщо синтаксис коректний
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            ast.parse(f.read(), file_path)
+        return None
+    except SyntaxError as e:
+        return e
+
 def check_python_syntax():
     """Перевірка синтаксису Python файлів"""
     log("🐍 Перевірка синтаксису Python...", "INFO")
@@ -110,13 +189,12 @@ def check_python_syntax():
     all_good = True
     
     for file_path in python_files:
-        if Path(file_path).exists():
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    compile(f.read(), file_path, 'exec')
+        if path_exists(file_path):
+            error = _syntax_error(file_path)
+            if error is None:
                 log(f"✅ Синтаксис OK: {file_path}", "SUCCESS")
-            except SyntaxError as e:
-                log(f"❌ Помилка синтаксису в {file_path}: {e}", "ERROR")
+            else:
+                log(f"❌ Помилка синтаксису в {file_path}: {error}", "ERROR")
                 all_good = False
         else:
             log(f"⚠️ Файл не знайдено: {file_path}", "WARNING")
@@ -143,25 +221,42 @@ def check_dependencies():
     
     return True
 
+def _git_dirty_files():
+    """
+    Отримати список змінених файлів Git
+    
+    Returns:
+        list: Шляхи незакомічених файлів (порожній якщо все закомічено)
+    """
+    if pygit2 is not None:
+        repo = pygit2.Repository(".")
+        return [
+            path for path, flags in repo.status().items()
+            if flags not in (pygit2.GIT_STATUS_CURRENT, pygit2.GIT_STATUS_IGNORED)
+        ]
+    
+    result = subprocess.run(['git', 'status', '--porcelain'],
+                            capture_output=True, text=True, check=True)
+    return result.stdout.strip().splitlines()
+
 def check_git_status():
     """Перевірка статусу Git"""
     log("📝 Перевірка Git статусу...", "INFO")
     
     try:
         # Перевірка чи є незакомічені зміни
-        result = subprocess.run(['git', 'status', '--porcelain'], 
-                              capture_output=True, text=True)
+        dirty_files = _git_dirty_files()
         
-        if result.stdout.strip():
-            log("⚠️ Є незакомічені зміни:", "WARNING")
-            print(result.stdout)
+        if dirty_files:
+            log("⚠️ Є незакомічені зміни:\n" + "\n".join(dirty_files), "WARNING")
             return False
         else:
             log("✅ Всі зміни закомічені", "SUCCESS")
             return True
             
-    except subprocess.CalledProcessError:
-        log("❌ Помилка при перевірці Git статусу", "ERROR")
+    except Exception as e:
+        # CalledProcessError / OSError для git, GitError для pygit2
+        log(f"❌ Помилка при перевірці Git статусу: {e}", "ERROR")
         return False
 
 def create_release_info():
@@ -193,8 +288,7 @@ def create_release_info():
         ]
     }
     
-    with open("release_info.json", "w", encoding="utf-8") as f:
-        json.dump(release_info, f, ensure_ascii=False, indent=2)
+    dump_json(release_info, "release_info.json")
     
     log("✅ Створено release_info.json", "SUCCESS")
     return True
@@ -209,15 +303,26 @@ def main():
         ("Синтаксис Python", check_python_syntax),
         ("Залежності", check_dependencies),
         ("Git статус", check_git_status),
-        ("Інформація про реліз", create_release_info),
     ]
     
-    all_passed = True
+    # Незалежні перевірки запускаємо одночасно, а їх вивід показуємо
+    # у порядку перевірок — кожен під своїм заголовком
+    with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        futures = [executor.submit(_run_buffered, check_func) for _, check_func in checks]
+        results = []
+        for (check_name, _), future in zip(checks, futures):
+            result, lines = future.result()
+            log(f"\n🔍 {check_name}...", "INFO")
+            for record in lines:
+                _logger.log(*record)
+            results.append(result)
+    
+    all_passed = all(results)
     
-    for check_name, check_func in checks:
-        log(f"\n🔍 {check_name}...", "INFO")
-        if not check_func():
-            all_passed = False
+    # Інформація про реліз записує файл — створюємо її останньою
+    log("\n🔍 Інформація про реліз...", "INFO")
+    if not create_release_info():
+        all_passed = False
     
     log("\n" + "=" * 50, "INFO")
     
@@ -7,6 +7,7 @@
 
 import sys
 import os
+import argparse
 import asyncio
 from datetime import datetime
 
@@ -17,8 +18,48 @@ from src.config import config
 from src.logger import log
 from src.telegram_updates_monitor import monitor_updates
 from src.html_renderer import HTMLRenderer
+from src.telegram_notify import SCHEDULE_CAPTIONS, send_photo
 
-async def main():
+def parse_args():
+    parser = argparse.ArgumentParser(description="Автоматический мониторинг обновлений графиков")
+    parser.add_argument("--send", "-s", action="store_true",
+                        help="Отправлять готовые графики в Telegram после генерации")
+    return parser.parse_args()
+
+async def upload_worker(queue: asyncio.Queue):
+    """
+    Собирать готовые изображения и отправить их в Telegram после рендеринга
+    
+    Элементы очереди — (kind, path); последний элемент — флаг успеха рендеринга.
+    Рендеры завершаются в произвольном порядке, поэтому изображения
+    буферизуются и при успехе отправляются строго в порядке SCHEDULE_CAPTIONS.
+    При ошибке рендеринга буфер отбрасывается: неполный набор графиков
+    в канал не попадает.
+    """
+    ready = {}
+    while True:
+        item = await queue.get()
+        if isinstance(item, bool):
+            succeeded = item
+            break
+        kind, path = item
+        ready[kind] = path
+    
+    if not succeeded:
+        if ready:
+            log(f"⚠️ Рендеринг не удался — отправка отменена ({len(ready)} изображений отброшено)")
+        return
+    
+    for kind in SCHEDULE_CAPTIONS:
+        if kind not in ready:
+            continue
+        path = ready[kind]
+        caption, with_stats = SCHEDULE_CAPTIONS[kind]
+        log(f"📤 Отправляю {kind}: {path}")
+        # send_photo блокирующий — выполняем в потоке, чтобы не блокировать цикл событий
+        await asyncio.to_thread(send_photo, path, caption, with_stats)
+
+async def main(send: bool = False):
     """Основная функция автоматического мониторинга"""
     log("🤖 Запуск автоматического мониторинга обновлений")
     log(f"⏰ Время запуска: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -33,8 +74,26 @@ async def main():
             # Перегенерируем изображения
             try:
                 json_path = config.get_json_path()
-                renderer = HTMLRenderer(str(json_path))
-                results = await renderer.generate_all_images("light")
+                
+                # Готовые изображения собирает отправщик; в канал они уходят только после успешного рендеринга
+                upload_queue = asyncio.Queue()
+                uploader = asyncio.create_task(upload_worker(upload_queue)) if send else None
+                
+                async def on_ready(kind: str, path: str):
+                    if kind in SCHEDULE_CAPTIONS:
+                        await upload_queue.put((kind, path))
+                
+                render_ok = False
+                try:
+                    async with HTMLRenderer(str(json_path)) as renderer:
+                        results = await renderer.generate_all_images(
+                            "light", on_ready=on_ready if send else None
+                        )
+                    render_ok = True
+                finally:
+                    if uploader:
+                        await upload_queue.put(render_ok)
+                        await uploader
                 
                 total_images = 0
                 total_images += len(results.get('full', []))
@@ -45,10 +104,6 @@ async def main():
                 log(f"✅ Перегенерация завершена - обновлено {total_images} файлов")
                 renderer.cleanup_temp()
                 
-                # Здесь можно добавить отправку уведомлений
-                # from src.telegram_notify import send_message
-                # send_message("🔄 Графики обновлены автоматически")
-                
             except Exception as e:
                 log(f"❌ Ошибка перегенерации изображений: {e}")
                 return False
@@ -64,7 +119,8 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        result = asyncio.run(main())
+        args = parse_args()
+        result = asyncio.run(main(args.send))
         exit_code = 0 if result else 1
         sys.exit(exit_code)
     except KeyboardInterrupt:
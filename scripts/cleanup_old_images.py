@@ -7,10 +7,24 @@
 
 import os
 import re
+import sys
+import logging
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
+# Додаємо корінь проекту в шлях
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.logger import SCRIPT_LOG_LEVELS, setup_queue_logging
+
+# Дата в імені файлу: gpv-*-YYYYMMDD-HHMMSS.png
+DATE_IN_FILENAME_RE = re.compile(r'-(\d{8})-')
+
+# Цикли лише додають запис у чергу, у stdout пише фоновий потік
+_logger = setup_queue_logging("cleanup_old_images")
+
 def log(message: str, level: str = "INFO"):
     """Логування з кольорами"""
     colors = {
@@ -24,16 +38,36 @@ def log(message: str, level: str = "INFO"):
     color = colors.get(level, colors["INFO"])
     reset = colors["RESET"]
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    print(f"{color}[{level}]{reset} {timestamp} {message}")
+    _logger.log(SCRIPT_LOG_LEVELS.get(level, logging.INFO), f"{color}[{level}]{reset} {timestamp} {message}")
 
 def extract_date_from_filename(filename: str) -> str:
     """
     Витягує дату з імені файлу
     Формат: gpv-*-YYYYMMDD-HHMMSS.png
     """
-    match = re.search(r'-(\d{8})-', filename)
+    # Швидкий шлях: у стандартному імені дата стоїть на фіксованій позиції від кінця
+    if len(filename) >= 20 and filename[-20] == '-' and filename[-11] == '-':
+        date = filename[-19:-11]
+        if date.isdigit():
+            return date
+    
+    # Нестандартні імена — через регулярний вираз
+    match = DATE_IN_FILENAME_RE.search(filename)
     return match.group(1) if match else None
 
+def _safe_unlink(file_path: Path):
+    """
+    Видалити файл без винятків
+    
+    Returns:
+        Optional[Exception]: None при успіху, інакше помилка
+    """
+    try:
+        file_path.unlink()
+        return None
+    except Exception as e:
+        return e
+
 def cleanup_old_images(images_dir: str, keep_days: int = 3, dry_run: bool = False):
     """
     Очищає старі зображення
@@ -53,16 +87,16 @@ def cleanup_old_images(images_dir: str, keep_days: int = 3, dry_run: bool = Fals
     
     # Отримуємо дати для збереження
     today = datetime.now()
-    keep_dates = []
-    
-    for i in range(keep_days):
-        date = today - timedelta(days=i)
-        keep_dates.append(date.strftime("%Y%m%d"))
+    keep_dates = {
+        (today - timedelta(days=i)).strftime("%Y%m%d")
+        for i in range(keep_days)
+    }
     
-    log(f"📅 Зберігаю зображення за дати: {', '.join(keep_dates)}", "INFO")
+    log(f"📅 Зберігаю зображення за дати: {', '.join(sorted(keep_dates, reverse=True))}", "INFO")
     
-    # Знаходимо всі PNG файли
-    png_files = list(images_path.glob("*.png"))
+    # Знаходимо всі PNG файли (один прохід по папці)
+    with os.scandir(images_path) as entries:
+        png_files = [Path(e.path) for e in entries if e.is_file() and e.name.endswith(".png")]
     log(f"📊 Знайдено зображень: {len(png_files)}", "INFO")
     
     if not png_files:
@@ -71,6 +105,7 @@ def cleanup_old_images(images_dir: str, keep_days: int = 3, dry_run: bool = Fals
     
     deleted_count = 0
     kept_count = 0
+    to_delete = []
     
     for file_path in png_files:
         filename = file_path.name
@@ -82,20 +117,28 @@ def cleanup_old_images(images_dir: str, keep_days: int = 3, dry_run: bool = Fals
             continue
         
         if file_date not in keep_dates:
-            if dry_run:
-                log(f"🗑️ [DRY RUN] Буде видалено: {filename} (дата: {file_date})", "WARNING")
-            else:
-                try:
-                    file_path.unlink()
-                    log(f"🗑️ Видалено: {filename} (дата: {file_date})", "SUCCESS")
-                except Exception as e:
-                    log(f"❌ Помилка видалення {filename}: {e}", "ERROR")
-                    kept_count += 1
-                    continue
-            deleted_count += 1
+            to_delete.append((file_path, file_date))
         else:
             kept_count += 1
     
+    if dry_run:
+        for file_path, file_date in to_delete:
+            log(f"🗑️ [DRY RUN] Буде видалено: {file_path.name} (дата: {file_date})", "WARNING")
+        deleted_count = len(to_delete)
+    elif to_delete:
+        # Видаляємо паралельно — unlink блокуючий, а потоки приховують його затримку
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            errors = list(executor.map(_safe_unlink, (fp for fp, _ in to_delete)))
+        
+        # Логуємо після завершення, щоб зберегти порядок виводу
+        for (file_path, file_date), error in zip(to_delete, errors):
+            if error is None:
+                log(f"🗑️ Видалено: {file_path.name} (дата: {file_date})", "SUCCESS")
+                deleted_count += 1
+            else:
+                log(f"❌ Помилка видалення {file_path.name}: {error}", "ERROR")
+                kept_count += 1
+    
     log("=" * 50, "INFO")
     log(f"📊 Результати очистки:", "INFO")
     log(f"  🗑️ Видалено: {deleted_count}", "SUCCESS" if deleted_count > 0 else "INFO")
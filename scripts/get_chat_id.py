@@ -3,6 +3,7 @@
 """
 Скрипт для отримання Chat ID з Telegram
 """
+import atexit
 import requests
 import json
 from dotenv import load_dotenv
@@ -24,6 +25,11 @@ else:
 BOT_TOKEN = os.getenv("BOT_TOKEN")
 print(f"🔑 BOT_TOKEN: {'знайдено' if BOT_TOKEN else 'не знайдено'}")
 
+# Одна HTTP-сесія на всі запити — з'єднання з api.telegram.org перевикористовується
+SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": "DNIPRO_PARSER/1.0"})
+atexit.register(SESSION.close)
+
 def get_chat_id():
     """Отримати Chat ID з останніх повідомлень"""
     if not BOT_TOKEN:
@@ -36,7 +42,7 @@ def get_chat_id():
     try:
         url = f"https://api.telegram.org/bot{BOT_TOKEN}/getUpdates"
         print(f"🌐 Запрос к: {url}")
-        response = requests.get(url)
+        response = SESSION.get(url, timeout=10)
         
         if response.status_code != 200:
             print(f"❌ Ошибка API: {response.status_code}")
@@ -115,7 +121,7 @@ def test_bot_token():
     
     try:
         url = f"https://api.telegram.org/bot{BOT_TOKEN}/getMe"
-        response = requests.get(url)
+        response = SESSION.get(url, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
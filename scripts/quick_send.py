@@ -3,28 +3,37 @@
 """
 Швидка відправка графіків в Telegram однією командою
 """
+import os
 import sys
 from pathlib import Path
 
-# Додаємо src в шлях
-sys.path.append(str(Path(__file__).parent / "src"))
+# Додаємо корінь проекту в шлях (той самий шлях імпорту, що й у send_schedule.py)
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from telegram_notify import send_photo, send_message
+from src.telegram_notify import send_photo, send_message
+from src.config import config, FULL_PATTERN
 
 def quick_send():
     """Швидко відправити останній загальний графік зі статистикою"""
-    images_dir = Path("out/images")
+    images_dir = config.IMAGES_DIR
     
-    # Шукаємо останній загальний графік
-    today_images = list(images_dir.glob("*today*.png"))
+    # Шукаємо найновіший загальний графік за один прохід по папці
+    latest = None
+    if images_dir.is_dir():
+        with os.scandir(images_dir) as entries:
+            latest = max(
+                (e for e in entries
+                 if e.is_file() and "-dark" not in e.name and FULL_PATTERN.match(e.name)),
+                key=lambda e: e.stat().st_mtime,
+                default=None
+            )
     
-    if not today_images:
+    if latest is None:
         print("❌ Загальний графік не знайдено!")
-        print("💡 Спочатку згенеруйте графік: python src/gener_im_full.py")
+        print("💡 Спочатку згенеруйте графік: python generate_all_images.py")
         return
     
-    # Беремо найновіший файл
-    latest_image = max(today_images, key=lambda f: f.stat().st_mtime)
+    latest_image = Path(latest.path)
     
     print(f"📤 Відправляю: {latest_image.name}")
     
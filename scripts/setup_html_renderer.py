@@ -7,6 +7,7 @@
 import subprocess
 import sys
 import os
+from collections import deque
 from pathlib import Path
 
 def log(message, level="INFO"):
@@ -23,22 +24,34 @@ def log(message, level="INFO"):
     reset = colors["RESET"]
     print(f"{color}[{level}]{reset} {message}")
 
-def run_command(cmd, description):
-    """Выполнить команду с логированием"""
+def run_command(cmd, description, tail_lines=50):
+    """
+    Выполнить команду с логированием
+    
+    Вывод команды показывается построчно по мере выполнения; в памяти
+    хранятся только последние tail_lines строк для отчёта об ошибке.
+    """
     log(f"Выполняю: {description}")
     log(f"Команда: {' '.join(cmd)}")
     
     try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        log(f"✅ {description} - успешно", "SUCCESS")
-        return True
-    except subprocess.CalledProcessError as e:
+        tail = deque(maxlen=tail_lines)
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                              text=True, bufsize=1) as proc:
+            for line in proc.stdout:
+                line = line.rstrip()
+                tail.append(line)
+                print(f"   {line}")
+            returncode = proc.wait()
+        
+        if returncode == 0:
+            log(f"✅ {description} - успешно", "SUCCESS")
+            return True
+        
         log(f"❌ {description} - ошибка", "ERROR")
-        log(f"Код ошибки: {e.returncode}", "ERROR")
-        if e.stdout:
-            log(f"Вывод: {e.stdout}", "WARNING")
-        if e.stderr:
-            log(f"Ошибка: {e.stderr}", "ERROR")
+        log(f"Код ошибки: {returncode}", "ERROR")
+        if tail:
+            log("Последние строки вывода:\n" + "\n".join(tail), "WARNING")
         return False
     except FileNotFoundError:
         log(f"❌ Команда не найдена: {cmd[0]}", "ERROR")
@@ -57,7 +70,7 @@ def check_python_version():
     return True
 
 def install_requirements():
-    """Установить зависимости из requirements.txt"""
+    """Установить зависимости из requirements.txt вместе с Playwright (один запуск pip)"""
     log("Устанавливаю зависимости Python...")
     
     requirements_file = Path("requirements.txt")
@@ -65,21 +78,15 @@ def install_requirements():
         log("❌ Файл requirements.txt не найден", "ERROR")
         return False
     
+    # Playwright ставится тем же вызовом pip — резолвер запускается один раз
     return run_command(
-        [sys.executable, "-m", "pip", "install", "-r", "requirements.txt"],
-        "Установка зависимостей Python"
+        [sys.executable, "-m", "pip", "install", "-r", "requirements.txt", "playwright"],
+        "Установка зависимостей Python и Playwright"
     )
 
 def install_playwright():
-    """Установить Playwright и браузеры"""
-    log("Устанавливаю Playwright...")
-    
-    # Установка Playwright
-    if not run_command(
-        [sys.executable, "-m", "pip", "install", "playwright"],
-        "Установка Playwright"
-    ):
-        return False
+    """Установить браузер Chromium для Playwright (пакет ставится в install_requirements)"""
+    log("Устанавливаю браузер для Playwright...")
     
     # Установка браузера Chromium
     return run_command(
@@ -92,7 +99,12 @@ def check_templates():
     log("Проверяю HTML шаблоны...")
     
     templates_dir = Path("исходники")
-    if not templates_dir.exists():
+    
+    # Одно чтение папки отвечает на все вопросы: есть ли папка, файлы и иконки
+    try:
+        with os.scandir(templates_dir) as entries:
+            names = {entry.name for entry in entries}
+    except FileNotFoundError:
         log("❌ Папка 'исходники' не найдена", "ERROR")
         log("   Убедитесь, что папка с HTML шаблонами существует", "WARNING")
         return False
@@ -107,19 +119,15 @@ def check_templates():
         "schedule-shared.js"
     ]
     
-    missing_files = []
-    for file_name in required_files:
-        file_path = templates_dir / file_name
-        if not file_path.exists():
-            missing_files.append(file_name)
+    missing_files = [file_name for file_name in required_files if file_name not in names]
     
     if missing_files:
         log(f"❌ Отсутствуют файлы: {', '.join(missing_files)}", "ERROR")
         return False
     
     # Проверяем SVG иконки
-    svg_files = list(templates_dir.glob("*.svg"))
-    log(f"✅ Найдено SVG иконок: {len(svg_files)}", "SUCCESS")
+    svg_count = sum(1 for name in names if name.endswith(".svg"))
+    log(f"✅ Найдено SVG иконок: {svg_count}", "SUCCESS")
     
     log("✅ Все необходимые шаблоны найдены", "SUCCESS")
     return True
@@ -155,11 +163,11 @@ def create_directories():
     ]
     
     for dir_name in directories:
-        dir_path = Path(dir_name)
-        if not dir_path.exists():
-            dir_path.mkdir(parents=True, exist_ok=True)
+        # Один mkdir вместо exists() + mkdir: FileExistsError значит папка уже есть
+        try:
+            Path(dir_name).mkdir(parents=True)
             log(f"✅ Создана папка: {dir_name}", "SUCCESS")
-        else:
+        except FileExistsError:
             log(f"✅ Папка существует: {dir_name}", "SUCCESS")
     
     return True
@@ -189,45 +197,65 @@ def test_html_renderer():
     log("✅ HTML рендерер готов к использованию", "SUCCESS")
     return True
 
+def run_steps(steps):
+    """
+    Выполнить шаги последовательно
+    
+    Returns:
+        dict: {функция шага: результат}
+    """
+    results = {}
+    for step_name, step_func in steps:
+        log(f"\n📋 Шаг: {step_name}", "INFO")
+        log("-" * 40, "INFO")
+        
+        results[step_func] = step_func()
+        if not results[step_func]:
+            log(f"❌ Шаг '{step_name}' завершился с ошибкой", "ERROR")
+    return results
+
+def abort_if_failed(results, step_func):
+    """Прервать установку, если критический шаг завершился с ошибкой"""
+    if not results.get(step_func, True):
+        log("🛑 Критическая ошибка - установка прервана", "ERROR")
+        sys.exit(1)
+
 def main():
     """Основная функция установки"""
     log("🚀 УСТАНОВКА HTML РЕНДЕРЕРА ДЛЯ DNIPRO_PARSER", "INFO")
     log("=" * 60, "INFO")
     
-    steps = [
-        ("Проверка версии Python", check_python_version),
+    # Версия Python проверяется первой — от неё зависит всё остальное
+    results = run_steps([("Проверка версии Python", check_python_version)])
+    abort_if_failed(results, check_python_version)
+    
+    # Шаги выполняются по очереди: вывод pip и Chromium идёт вживую и не
+    # перемешивается с логами проверок
+    results.update(run_steps([
         ("Установка зависимостей Python", install_requirements),
-        ("Установка Playwright", install_playwright),
+        ("Установка Chromium для Playwright", install_playwright),
+    ]))
+    abort_if_failed(results, install_playwright)
+    
+    results.update(run_steps([
         ("Проверка HTML шаблонов", check_templates),
         ("Проверка JSON данных", check_json_data),
         ("Создание папок", create_directories),
-        ("Тестирование рендерера", test_html_renderer)
-    ]
+        # Тест рендерера требует установленных пакетов
+        ("Тестирование рендерера", test_html_renderer),
+    ]))
     
-    success_count = 0
-    
-    for step_name, step_func in steps:
-        log(f"\n📋 Шаг: {step_name}", "INFO")
-        log("-" * 40, "INFO")
-        
-        if step_func():
-            success_count += 1
-        else:
-            log(f"❌ Шаг '{step_name}' завершился с ошибкой", "ERROR")
-            
-            # Для критических шагов прерываем установку
-            if step_func in [check_python_version, install_playwright]:
-                log("🛑 Критическая ошибка - установка прервана", "ERROR")
-                sys.exit(1)
+    steps_count = len(results)
+    success_count = sum(1 for ok in results.values() if ok)
     
     # Итоги
     log("\n" + "=" * 60, "INFO")
     log("📊 РЕЗУЛЬТАТЫ УСТАНОВКИ", "INFO")
     log("=" * 60, "INFO")
     
-    log(f"Выполнено шагов: {success_count}/{len(steps)}", "INFO")
+    log(f"Выполнено шагов: {success_count}/{steps_count}", "INFO")
     
-    if success_count == len(steps):
+    if success_count == steps_count:
         log("🎉 Установка завершена успешно!", "SUCCESS")
         log("\n💡 Следующие шаги:", "INFO")
         log("1. Запустите парсер: python src/main.py --parse", "INFO")
@@ -20,8 +20,70 @@ from zoneinfo import ZoneInfo
 # Додаємо src в шлях для імпорту модулів
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.telegram_notify import send_photo, send_message, send_stats_only, log
-from src.config import config
+from src.telegram_notify import SCHEDULE_CAPTIONS, send_photo, send_message, send_stats_only, log
+from src.config import (
+    config, compile_filename_pattern,
+    FULL_PATTERN, GROUPS_TODAY_PATTERN, GROUPS_TOMORROW_PATTERN,
+)
+
+KYIV_TZ = ZoneInfo("Europe/Kyiv")
+
+# Тексти довідки та меню збираються один раз і виводяться одним записом
+HELP_TEXT = "\n".join([
+    "\n📋 Доступні команди:",
+    "python send_schedule.py all              - Відправити всі графіки",
+    "python send_schedule.py stats            - Відправити тільки статистику",
+    "python send_schedule.py group 1-1        - Відправити графік групи 1.1",
+    "python send_schedule.py list             - Показати доступні зображення",
+    "python send_schedule.py                  - Показати інтерактивне меню",
+])
+
+MENU_TEXT = "\n".join([
+    "\n📋 Виберіть дію:",
+    "1. ☀️  Відправити всі графіки",
+    "2. 📈  Відправити тільки статистику",
+    "3. 👥  Відправити графік групи",
+    "4. 📁  Показати доступні зображення",
+    "5. ❌  Вихід",
+])
+
+def _latest(images_dir, patterns):
+    """
+    Знайти найновіші світлі зображення для кількох шаблонів за один прохід scandir
+    
+    Args:
+        images_dir: Папка з зображеннями
+        patterns: Словник {ключ: скомпільований шаблон імені}
+        
+    Returns:
+        Dict[str, Tuple[Optional[Path], int]]: Для кожного ключа — найновіший
+        файл (або None) та кількість збігів
+    """
+    best = {key: (None, -1.0, 0) for key in patterns}
+    
+    try:
+        with os.scandir(images_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if "-dark" in name or not entry.is_file(follow_symlinks=False):
+                    continue
+                
+                mtime = None
+                for key, pattern in patterns.items():
+                    if pattern.match(name):
+                        if mtime is None:
+                            mtime = entry.stat(follow_symlinks=False).st_mtime
+                        best_entry, best_mtime, count = best[key]
+                        if mtime > best_mtime:
+                            best_entry, best_mtime = entry, mtime
+                        best[key] = (best_entry, best_mtime, count + 1)
+    except FileNotFoundError:
+        pass
+    
+    return {
+        key: (Path(entry.path) if entry else None, count)
+        for key, (entry, _, count) in best.items()
+    }
 
 def send_all_schedules():
     """Відправити всі доступні графіки в Telegram"""
@@ -31,50 +93,34 @@ def send_all_schedules():
         print("❌ Папка output/images не знайдена!")
         return
     
-    # Паттерни для HTML-генерованих зображень (тільки світла тема)
-    full_pattern = f"gpv-full-*.png"
-    groups_today_pattern = f"gpv-all-groups-*.png"
-    groups_tomorrow_pattern = f"gpv-all-groups-tomorrow-*.png"
-    
-    # Виключаємо темні зображення
-    full_images = [img for img in images_dir.glob(full_pattern) if "-dark" not in img.name]
-    groups_today_images = [img for img in images_dir.glob(groups_today_pattern) if "-dark" not in img.name]
-    groups_tomorrow_images = [img for img in images_dir.glob(groups_tomorrow_pattern) if "-dark" not in img.name]
+    # Один прохід по папці для всіх шаблонів (тільки світла тема)
+    found = _latest(images_dir, {
+        "full": FULL_PATTERN,
+        "today": GROUPS_TODAY_PATTERN,
+        "tomorrow": GROUPS_TOMORROW_PATTERN,
+    })
+    latest_full, full_count = found["full"]
+    latest_today, today_count = found["today"]
+    latest_tomorrow, tomorrow_count = found["tomorrow"]
     
     print(f"🔍 Знайдено зображень:")
-    print(f"   📊 Повних графіків: {len(full_images)}")
-    print(f"   📅 Матриць груп (сьогодні): {len(groups_today_images)}")
-    print(f"   📅 Матриць груп (завтра): {len(groups_tomorrow_images)}")
-    
-    # Відправляємо повний графік (сьогодні + тиждень)
-    if full_images:
-        latest_full = max(full_images, key=lambda f: f.stat().st_mtime)
-        print(f"📤 Відправляю повний графік: {latest_full.name}")
-        
-        caption = f"📊 <b>Повний графік відключень</b> ☀️\n\n"
-        caption += f"Сьогодні/завтра + тижневий прогноз"
-        
-        send_photo(str(latest_full), caption, with_stats=True)
-    
-    # Відправляємо матрицю груп на сьогодні
-    if groups_today_images:
-        latest_today = max(groups_today_images, key=lambda f: f.stat().st_mtime)
-        print(f"📤 Відправляю матрицю груп (сьогодні): {latest_today.name}")
-        
-        caption = f"📊 <b>Всі групи на сьогодні</b> ☀️\n\n"
-        caption += f"Матриця відключень по всіх групах"
-        
-        send_photo(str(latest_today), caption, with_stats=False)
+    print(f"   📊 Повних графіків: {full_count}")
+    print(f"   📅 Матриць груп (сьогодні): {today_count}")
+    print(f"   📅 Матриць груп (завтра): {tomorrow_count}")
     
-    # Відправляємо матрицю груп на завтра (якщо є)
-    if groups_tomorrow_images:
-        latest_tomorrow = max(groups_tomorrow_images, key=lambda f: f.stat().st_mtime)
-        print(f"📤 Відправляю матрицю груп (завтра): {latest_tomorrow.name}")
+    # Відправляємо по черзі: у каналі повний графік зі статистикою завжди йде першим
+    for kind, latest, label in (
+        ("full", latest_full, "повний графік"),                           # Сьогодні + тиждень
+        ("groups-today", latest_today, "матрицю груп (сьогодні)"),
+        ("groups-tomorrow", latest_tomorrow, "матрицю груп (завтра)"),  # Якщо є
+    ):
+        if not latest:
+            continue
         
-        caption = f"📊 <b>Всі групи на завтра</b> ☀️\n\n"
-        caption += f"Матриця відключень по всіх групах"
+        print(f"📤 Відправляю {label}: {latest.name}")
         
-        send_photo(str(latest_tomorrow), caption, with_stats=False)
+        caption, with_stats = SCHEDULE_CAPTIONS[kind]
+        send_photo(str(latest), caption, with_stats=with_stats)
 
 def send_group_schedule(group_number):
     """
@@ -85,17 +131,15 @@ def send_group_schedule(group_number):
     """
     images_dir = config.IMAGES_DIR
     
-    # Шукаємо зображення для групи (тільки світлі)
+    # Шукаємо найновіше зображення для групи (тільки світлі)
     pattern = f"gpv-{group_number}-emergency-*.png"
-    group_images = [img for img in images_dir.glob(pattern) if "-dark" not in img.name]
+    latest_image, _ = _latest(images_dir, {"group": compile_filename_pattern(pattern)})["group"]
     
-    if not group_images:
+    if not latest_image:
         print(f"❌ Не знайдено зображень для групи {group_number}")
         print(f"   Шукав за шаблоном: {pattern}")
         return
     
-    # Беремо найновіше зображення
-    latest_image = max(group_images, key=lambda f: f.stat().st_mtime)
     print(f"📤 Відправляю графік для групи {group_number}: {latest_image.name}")
     
     caption = f"📊 <b>Графік відключень - Група {group_number}</b> ☀️\n\n"
@@ -116,38 +160,59 @@ def list_available_images():
         print("❌ Папка output/images не знайдена!")
         return
     
-    images = list(images_dir.glob("*.png"))
-    if not images:
+    # Один прохід: рахуємо PNG, відкидаємо темні та одразу групуємо за типами
+    # (stat береться з DirEntry один раз і використовується для розміру та часу)
+    images_count = 0
+    light_count = 0
+    full_imgs, groups_imgs, emergency_imgs, week_imgs, summary_imgs = [], [], [], [], []
+    
+    with os.scandir(images_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if not name.endswith(".png"):
+                continue
+            images_count += 1
+            
+            # Показуємо тільки світлі зображення
+            if "-dark" in name:
+                continue
+            light_count += 1
+            
+            if "gpv-full" in name:
+                bucket = full_imgs
+            elif "gpv-all-groups" in name:
+                bucket = groups_imgs
+            elif "emergency" in name and "gpv-all" not in name:
+                bucket = emergency_imgs
+            elif "week" in name:
+                bucket = week_imgs
+            elif "summary" in name:
+                bucket = summary_imgs
+            else:
+                continue
+            bucket.append((name, entry.stat()))
+    
+    if not images_count:
         print("❌ Зображення не знайдені!")
         print("💡 Спочатку згенеруйте зображення:")
         print("   python generate_all_images.py")
         print("   або python test_html_renderer.py")
         return
     
-    # Показуємо тільки світлі зображення
-    light_images = [img for img in images if "-dark" not in img.name]
-    
-    print(f"📁 Знайдено {len(light_images)} зображень:")
+    print(f"📁 Знайдено {light_count} зображень:")
     print("=" * 60)
     
-    if light_images:
-        print(f"\n☀️ Світлі ({len(light_images)} шт.):")
+    if light_count:
+        print(f"\n☀️ Світлі ({light_count} шт.):")
         print("-" * 40)
         
-        # Групуємо за типами
-        full_imgs = [img for img in light_images if "gpv-full" in img.name]
-        groups_imgs = [img for img in light_images if "gpv-all-groups" in img.name]
-        emergency_imgs = [img for img in light_images if "emergency" in img.name and "gpv-all" not in img.name]
-        week_imgs = [img for img in light_images if "week" in img.name]
-        summary_imgs = [img for img in light_images if "summary" in img.name]
-        
         def show_subgroup(imgs, subtype):
             if imgs:
                 print(f"  📊 {subtype}:")
-                for img in sorted(imgs):
-                    size_mb = img.stat().st_size / (1024 * 1024)
-                    mtime = datetime.fromtimestamp(img.stat().st_mtime, ZoneInfo("Europe/Kyiv"))
-                    print(f"    📄 {img.name}")
+                for name, st in sorted(imgs):
+                    size_mb = st.st_size / (1024 * 1024)
+                    mtime = datetime.fromtimestamp(st.st_mtime, KYIV_TZ)
+                    print(f"    📄 {name}")
                     print(f"       Розмір: {size_mb:.1f} МБ | Створено: {mtime.strftime('%Y-%m-%d %H:%M:%S')}")
         
         show_subgroup(full_imgs, "Повні графіки")
@@ -184,22 +249,12 @@ def main():
 
 def show_help():
     """Показати довідку по доступних командах"""
-    print("\n📋 Доступні команди:")
-    print("python send_schedule.py all              - Відправити всі графіки")
-    print("python send_schedule.py stats            - Відправити тільки статистику")
-    print("python send_schedule.py group 1-1        - Відправити графік групи 1.1")
-    print("python send_schedule.py list             - Показати доступні зображення")
-    print("python send_schedule.py                  - Показати інтерактивне меню")
+    print(HELP_TEXT)
 
 def show_menu():
     """Показати інтерактивне меню для вибору дій"""
     while True:
-        print("\n📋 Виберіть дію:")
-        print("1. ☀️  Відправити всі графіки")
-        print("2. 📈  Відправити тільки статистику")
-        print("3. 👥  Відправити графік групи")
-        print("4. 📁  Показати доступні зображення")
-        print("5. ❌  Вихід")
+        print(MENU_TEXT)
         
         try:
             choice = input("\n👉 Ваш вибір (1-5): ").strip()
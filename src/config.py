@@ -6,6 +6,9 @@
 """
 
 import os
+import re
+import fnmatch
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 from dotenv import load_dotenv
@@ -13,6 +16,16 @@ from dotenv import load_dotenv
 # Завантажуємо змінні з .env файлу
 load_dotenv()
 
+@lru_cache(maxsize=None)
+def compile_filename_pattern(pattern: str) -> re.Pattern:
+    """Скомпілювати glob-шаблон імені файлу в регулярний вираз (з кешем)"""
+    return re.compile(fnmatch.translate(pattern))
+
+# Шаблони імен HTML-генерованих зображень (спільні для send_schedule.py та scripts/quick_send.py)
+FULL_PATTERN = compile_filename_pattern("gpv-full-*.png")
+GROUPS_TODAY_PATTERN = compile_filename_pattern("gpv-all-groups-*.png")
+GROUPS_TOMORROW_PATTERN = compile_filename_pattern("gpv-all-groups-tomorrow-*.png")
+
 class Config:
     """Клас для управління конфігурацією проекту"""
     
@@ -39,6 +52,7 @@ class Config:
     # Рендеринг налаштування
     RENDER_SCALE = 2.0  # Масштаб для високої якості
     RENDER_TIMEOUT = 30000  # Таймаут рендерингу в мс
+    RENDER_CONCURRENCY = int(os.getenv("PW_CONCURRENCY", "4"))  # Кількість одночасних сторінок браузера
     
     # Логування
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -48,6 +62,9 @@ class Config:
     CLEANUP_DAYS = int(os.getenv("CLEANUP_DAYS", "5"))
     CLEANUP_EXTENSIONS = [".png", ".jpg", ".jpeg", ".webp"]
     
+    # Чи створені робочі папки (створюються ліниво, а не при імпорті)
+    _directories_ready = False
+    
     @classmethod
     def validate(cls) -> bool:
         """
@@ -81,27 +98,39 @@ class Config:
         
         for directory in directories:
             directory.mkdir(parents=True, exist_ok=True)
+        
+        cls._directories_ready = True
+    
+    @classmethod
+    def ensure_directories(cls) -> None:
+        """Створити необхідні папки, якщо це ще не зроблено в цьому процесі"""
+        if not cls._directories_ready:
+            cls.create_directories()
     
     @classmethod
     def get_json_path(cls) -> Path:
         """Отримати шлях до JSON файлу з даними"""
+        cls.ensure_directories()
         return cls.OUTPUT_DIR / cls.JSON_FILENAME
     
     @classmethod
     def get_latest_json(cls) -> Optional[Path]:
         """Знайти останній JSON файл в папці output"""
-        json_files = list(cls.OUTPUT_DIR.glob("*.json"))
-        
-        if not json_files:
+        cls.ensure_directories()
+        if not cls.OUTPUT_DIR.is_dir():
             return None
         
-        # Сортуємо за часом модифікації
-        latest_json = max(json_files, key=lambda f: f.stat().st_mtime)
-        return latest_json
+        # Один прохід scandir: DirEntry кешує результат stat()
+        with os.scandir(cls.OUTPUT_DIR) as entries:
+            latest = max(
+                (e for e in entries if e.is_file() and e.name.endswith(".json")),
+                key=lambda e: e.stat().st_mtime,
+                default=None
+            )
+        
+        return Path(latest.path) if latest else None
 
 
 # Глобальний екземпляр конфігурації
-config = Config()
-
-# Створюємо необхідні папки при імпорті
-config.create_directories()
\ No newline at end of file
+# (папки створюються ліниво — при першому зверненні до шляхів даних)
+config = Config()
\ No newline at end of file
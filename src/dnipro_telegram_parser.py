@@ -4,14 +4,37 @@
 
 import asyncio
 import re
-import json
 from datetime import datetime, date, timedelta
 from zoneinfo import ZoneInfo
 from playwright.async_api import async_playwright
+import math
 import os
 
+from .logger import get_file_logger
+from .utils import dump_json, load_json
+
 TZ = ZoneInfo("Europe/Kyiv")
 URL = "https://t.me/s/cek_info"
+
+# t.me/s/ віддає вже відрендерений HTML - картинки, шрифти і стилі для парсингу не потрібні
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+# Повертає [{text, date}] для кожного поста на сторінці.
+# textContent не потребує розкладки сторінки, як innerText; переноси рядків
+# у постах задані через <br>, тому їх замінюємо на "\n" перед читанням тексту
+EXTRACT_POSTS_JS = """
+() => Array.from(document.querySelectorAll('.tgme_widget_message')).map(post => {
+    const text = post.querySelector('.tgme_widget_message_text');
+    const date = post.querySelector('.tgme_widget_message_date time');
+    if (text) {
+        text.querySelectorAll('br').forEach(br => br.replaceWith('\\n'));
+    }
+    return {
+        text: text ? text.textContent : null,
+        date: date ? date.getAttribute('datetime') : null
+    };
+})
+"""
 OUTPUT_FILE = "output/Dneproblenergo.json"
 
 LOG_DIR = "logs"
@@ -20,6 +43,9 @@ FULL_LOG_FILE = os.path.join(LOG_DIR, "full_log.log")
 os.makedirs(LOG_DIR, exist_ok=True)
 os.makedirs("output", exist_ok=True)
 
+# Рядки логу дописуються у full_log.log (з урахуванням його ротації)
+_file_log = get_file_logger("dnipro_parser.full_log", FULL_LOG_FILE)
+
 # Ключові слова для пошуку постів з графіками
 KEYWORDS = [
     "графіки погодинних відключень",
@@ -34,26 +60,79 @@ KEYWORDS = [
     "черга:"
 ]
 
+# Усі ключові слова перевіряються одним об'єднаним регулярним виразом за один прохід тексту
+_KEYWORD_RE = re.compile("|".join(map(re.escape, KEYWORDS)), re.IGNORECASE)
+
+# Назви місяців у родовому відмінку
+MONTHS = {
+    'січня': '01', 'лютого': '02', 'березня': '03', 'квітня': '04',
+    'травня': '05', 'червня': '06', 'липня': '07', 'серпня': '08',
+    'вересня': '09', 'жовтня': '10', 'листопада': '11', 'грудня': '12'
+}
+_MONTH_NAMES = '|'.join(MONTHS.keys())
+MONTH_BY_NUMBER = {int(number): name for name, number in MONTHS.items()}
+
+# Регулярні вирази компілюються один раз при імпорті
+DATE_RE = re.compile(
+    r"(?:у\s+(?P<dow>[\wʼ']+),\s+)?(?P<day>\d{1,2})\s+(?P<mon>" + _MONTH_NAMES + r")",
+    re.IGNORECASE
+)
+GROUP_RE = re.compile(r'📌\s*(\d+\.\d+)\s*черг[аи]:')
+# Години та хвилини початку і кінця інтервалу виходять окремими групами
+INTERVAL_RE = re.compile(r'з\s+(\d{1,2}):(\d{2})\s+до\s+(\d{1,2}):(\d{2})')
+WARNING_RE = re.compile(r'Попереджаємо')
+
+# Межі кожної години доби: (ключ, початок, середина, кінець); час 1 = 0:00-1:00
+HOUR_EDGES = tuple((str(hour), hour - 1.0, hour - 0.5, float(hour)) for hour in range(1, 25))
+
+# Шаблон доби для групи - по замовчуванню світло є всі 24 години
+DEFAULT_DAY = {key: "yes" for key, _, _, _ in HOUR_EDGES}
+
+# Незмінна частина вихідного JSON: підписи годин і типів стану
+PRESET = {
+    "time_zone": {
+        str(i): [f"{i - 1:02d}-{i:02d}", f"{i - 1:02d}:00", f"{i:02d}:00"]
+        for i in range(1, 25)
+    },
+    "time_type": {
+        "yes": "Світло є",
+        "maybe": "Можливе відключення",
+        "no": "Світла немає",
+        "first": "Світла не буде перші 30 хв.",
+        "second": "Світла не буде другі 30 хв"
+    }
+}
+
 
 def log(message: str):
     timestamp = datetime.now(TZ).strftime("%Y-%m-%d %H:%M:%S")
     line = f"{timestamp} [dnipro_parser] {message}"
     print(line)
-    with open(FULL_LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(line + "\n")
-
-
-def time_to_hour(hhmm: str) -> float:
-    hh, mm = map(int, hhmm.split(":"))
-    return hh + (mm / 60.0)
+    _file_log.info(line)
 
 
 def is_schedule_post(text: str) -> bool:
     """Перевіряє чи містить текст ключові слова про графіки"""
     if not text:
         return False
-    text_lower = text.lower()
-    return any(keyword.lower() in text_lower for keyword in KEYWORDS)
+    return _KEYWORD_RE.search(text) is not None
+
+
+def compile_target_dates_re(*dates) -> re.Pattern:
+    """Регулярний вираз "<число> <місяць>" для заданих дат
+
+    Число не може бути продовженням іншого: для 1 грудня не підходять "11 грудня" чи "21 грудня"
+
+    Args:
+        dates: дати (date), які шукаємо в тексті поста
+
+    Returns:
+        Скомпільований регулярний вираз без урахування регістру
+    """
+    return re.compile(
+        "|".join(rf"(?<!\d)0?{d.day}\s+{MONTH_BY_NUMBER[d.month]}" for d in dates),
+        re.IGNORECASE
+    )
 
 
 async def fetch_posts() -> list:
@@ -71,6 +150,12 @@ async def fetch_posts() -> list:
         context = await browser.new_context(
             user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         )
+        await context.route(
+            "**/*",
+            lambda route: route.abort()
+            if route.request.resource_type in BLOCKED_RESOURCE_TYPES
+            else route.continue_()
+        )
         page = await context.new_page()
         
         try:
@@ -78,42 +163,14 @@ async def fetch_posts() -> list:
             await page.goto(URL, wait_until="domcontentloaded", timeout=60000)
             await page.wait_for_selector(".tgme_widget_message", timeout=30000)
             
-            # Чекаємо додатково для рендерингу контенту
-            await page.wait_for_timeout(3000)
-            
-            # Знаходимо всі пости
-            posts = await page.query_selector_all(".tgme_widget_message")
+            # Текст і дату всіх постів забираємо одним викликом у браузер
+            posts = await page.evaluate(EXTRACT_POSTS_JS)
             log(f"✔️ Знайдено {len(posts)} постів на сторінці")
             
-            filtered_posts = []
-            
-            for post in posts:
-                try:
-                    # Отримуємо текст поста
-                    text_element = await post.query_selector(".tgme_widget_message_text")
-                    if not text_element:
-                        continue
-                    
-                    post_text = await text_element.inner_text()
-                    
-                    # Перевіряємо чи це пост з графіком
-                    if not is_schedule_post(post_text):
-                        continue
-                    
-                    # Отримуємо дату поста
-                    date_element = await post.query_selector(".tgme_widget_message_date time")
-                    post_date_str = None
-                    if date_element:
-                        post_date_str = await date_element.get_attribute("datetime")
-                    
-                    filtered_posts.append({
-                        'text': post_text,
-                        'date': post_date_str
-                    })
-                    
-                except Exception as e:
-                    log(f"⚠️ Помилка обробки поста: {e}")
-                    continue
+            filtered_posts = [
+                post for post in posts
+                if post['text'] and is_schedule_post(post['text'])
+            ]
             
             log(f"✔️ Знайдено {len(filtered_posts)} постів з графіками")
             
@@ -129,112 +186,47 @@ def put_interval(result: dict, group_id: str, t1: float, t2: float) -> None:
     # t1 += 1.0
     # t2 += 1.0
     
-    for hour in range(1, 25):
-        h_start = float(hour - 1)  # час 1 = 0:00-1:00
-        h_mid = h_start + 0.5
-        h_end = h_start + 1.0
+    # Інтервал зачіпає лише години від floor(t1) + 1 до ceil(t2) - решту не перебираємо
+    first_hour = max(math.floor(t1) + 1, 1)
+    last_hour = min(math.ceil(t2), 24)
+    group = result[group_id]
 
+    for key, h_start, h_mid, h_end in HOUR_EDGES[first_hour - 1:last_hour]:
         first_off = (t1 < h_mid and t2 > h_start)
         second_off = (t1 < h_end and t2 > h_mid)
 
-        if not first_off and not second_off:
-            continue
-
-        key = str(hour)
-
         if first_off and second_off:
-            result[group_id][key] = "no"
+            group[key] = "no"
         elif first_off:
-            result[group_id][key] = "first"
+            group[key] = "first"
         elif second_off:
-            result[group_id][key] = "second"
+            group[key] = "second"
 
 
-def extract_date_from_post(text: str, debug: bool = False) -> str:
-    """Витягує дату з тексту поста для формату ЦЕК"""
-    months = {
-        'січня': '01', 'лютого': '02', 'березня': '03', 'квітня': '04',
-        'травня': '05', 'червня': '06', 'липня': '07', 'серпня': '08',
-        'вересня': '09', 'жовтня': '10', 'листопада': '11', 'грудня': '12'
-    }
-    
-    # Спроба 1: Шукаємо дату в форматі "19 ГРУДНЯ" (як у прикладі ЦЕК)
-    date_pattern_caps = r'(\d{1,2})\s+(' + '|'.join([m.upper() for m in months.keys()]) + r')'
-    
-    matches = list(re.finditer(date_pattern_caps, text, re.IGNORECASE))
-    
-    if debug and matches:
-        log(f"   🔍 Знайдено {len(matches)} збігів з великими літерами")
-    
-    for idx, match in enumerate(matches, 1):
-        day_num = match.group(1)
-        month_name = match.group(2).lower()
-        
-        if debug:
-            log(f"   📍 Збіг {idx}: '{day_num} {month_name}'")
-        
-        day = day_num.zfill(2)
-        month = months.get(month_name)
-        
-        if month:
-            date_str = f"{day}.{month}.{datetime.now(TZ).year}"
-            if debug:
-                log(f"   ✅ Знайдено дату: {date_str}")
-            return date_str
-    
-    # Спроба 2: Шукаємо "у [день_тижня], [число] [місяць]"
-    date_pattern_with_day = r'у\s+([\wʼ\']+),\s+(\d{1,2})\s+(' + '|'.join(months.keys()) + r')'
-    
-    matches = list(re.finditer(date_pattern_with_day, text, re.IGNORECASE))
-    
-    if debug and matches:
-        log(f"   🔍 Знайдено {len(matches)} збігів з днем тижня")
-    
-    for idx, match in enumerate(matches, 1):
-        day_of_week = match.group(1).lower()
-        day_num = match.group(2)
-        month_name = match.group(3).lower()
-        
-        if debug:
-            log(f"   📍 Збіг {idx}: 'у {day_of_week}, {day_num} {month_name}'")
-        
-        # Перевіряємо що це дійсно день тижня
-        days_of_week = [
-            'понеділок', 'вівторок', 'середу', 'четвер', 'п\'ятницю', 'пʼятницю', 'суботу', 'неділю',
-            'понеділка', 'вівторка', 'середи', 'четверга', 'п\'ятниці', 'пʼятниці', 'суботи', 'неділі'
-        ]
-        
-        if day_of_week in days_of_week:
-            if debug:
-                log(f"   ✅ '{day_of_week}' - це день тижня!")
-            
-            day = day_num.zfill(2)
-            month = months.get(month_name)
-            
-            if month:
-                date_str = f"{day}.{month}.{datetime.now(TZ).year}"
-                return date_str
-    
-    # Спроба 3: Шукаємо просто "[число] [місяць]" без дня тижня
-    date_pattern_simple = r'(\d{1,2})\s+(' + '|'.join(months.keys()) + r')'
-    
-    matches_simple = list(re.finditer(date_pattern_simple, text, re.IGNORECASE))
-    
-    if debug and matches_simple:
-        log(f"   🔍 Знайдено {len(matches_simple)} збігів без дня тижня")
+def extract_date_from_post(text: str, year: int = None, debug: bool = False) -> str:
+    """Витягує дату з тексту поста для формату ЦЕК
+
+    Формати "19 ГРУДНЯ", "у п'ятницю, 19 грудня" та "19 грудня" покриває один
+    регулярний вираз без урахування регістру, тож текст проходиться лише раз.
+    Рік передає main (один раз на запуск), інакше береться поточний.
+    """
+    if year is None:
+        year = datetime.now(TZ).year
     
-    for idx, match in enumerate(matches_simple, 1):
-        day_num = match.group(1)
-        month_name = match.group(2).lower()
+    for idx, match in enumerate(DATE_RE.finditer(text), 1):
+        day_of_week = match.group('dow')
+        day_num = match.group('day')
+        month_name = match.group('mon').lower()
         
         if debug:
-            log(f"   📍 Збіг {idx}: '{day_num} {month_name}'")
+            prefix = f"у {day_of_week.lower()}, " if day_of_week else ""
+            log(f"   📍 Збіг {idx}: '{prefix}{day_num} {month_name}'")
         
         day = day_num.zfill(2)
-        month = months.get(month_name)
+        month = MONTHS.get(month_name)
         
         if month:
-            date_str = f"{day}.{month}.{datetime.now(TZ).year}"
+            date_str = f"{day}.{month}.{year}"
             if debug:
                 log(f"   ✅ Знайдено дату: {date_str}")
             return date_str
@@ -247,8 +239,7 @@ def parse_schedule_from_text(text: str) -> dict:
     result = {}
     
     # Ищем все группы и их позиции в тексте
-    group_pattern = r'📌\s*(\d+\.\d+)\s*черг[аи]:'
-    group_matches = list(re.finditer(group_pattern, text))
+    group_matches = list(GROUP_RE.finditer(text))
     
     if not group_matches:
         return result
@@ -259,7 +250,7 @@ def parse_schedule_from_text(text: str) -> dict:
         group_id = f"GPV{group_num}"
         
         # Инициализируем группу - по умолчанию везде есть свет
-        result[group_id] = {str(h): "yes" for h in range(1, 25)}
+        result[group_id] = DEFAULT_DAY.copy()
         
         # Определяем границы текста для этой группы
         start_pos = group_match.end()
@@ -268,9 +259,9 @@ def parse_schedule_from_text(text: str) -> dict:
             end_pos = group_matches[i + 1].start()
         else:
             # Последняя группа - берем до конца или до предупреждения
-            warning_match = re.search(r'Попереджаємо', text[start_pos:])
+            warning_match = WARNING_RE.search(text, start_pos)
             if warning_match:
-                end_pos = start_pos + warning_match.start()
+                end_pos = warning_match.start()
             else:
                 end_pos = len(text)
         
@@ -278,13 +269,13 @@ def parse_schedule_from_text(text: str) -> dict:
         group_text = text[start_pos:end_pos]
         
         # Ищем все интервалы в тексте группы
-        intervals = re.findall(r'з\s+(\d{1,2}:\d{2})\s+до\s+(\d{1,2}:\d{2})', group_text)
+        intervals = INTERVAL_RE.findall(group_text)
         
-        for start_time, end_time in intervals:
+        for h1, m1, h2, m2 in intervals:
             try:
                 # Конвертируем время в часы (float)
-                t1 = time_to_hour(start_time)
-                t2 = time_to_hour(end_time)
+                t1 = int(h1) + int(m1) / 60.0
+                t2 = int(h2) + int(m2) / 60.0
                 
                 # Обрабатываем случай когда время переходит через полночь
                 if t2 <= t1:  # например, з 23:30 до 02:30
@@ -295,7 +286,7 @@ def parse_schedule_from_text(text: str) -> dict:
                     put_interval(result, group_id, t1, t2)
                     
             except Exception as e:
-                log(f"⚠️ Помилка парсингу інтервалу {start_time}-{end_time}: {e}")
+                log(f"⚠️ Помилка парсингу інтервалу {h1}:{m1}-{h2}:{m2}: {e}")
                 continue
     
     return result
@@ -309,10 +300,20 @@ async def main():
         log("❌ Не знайдено постів з графіками")
         return False
 
-    today = datetime.now(TZ).date()
+    now = datetime.now(TZ)
+    today = now.date()
     tomorrow = today + timedelta(days=1)
     today_str = today.strftime("%d.%m.%Y")
     tomorrow_str = tomorrow.strftime("%d.%m.%Y")
+    
+    # Ключі fact.data - timestamp початку доби, у порядку від меншої дати до більшої
+    date_keys = {
+        date_str: str(int(datetime(d.year, d.month, d.day, tzinfo=TZ).timestamp()))
+        for date_str, d in ((today_str, today), (tomorrow_str, tomorrow))
+    }
+
+    # Швидкий відсів постів, у яких узагалі немає "<число> <місяць>" на сьогодні чи завтра
+    target_dates_re = compile_target_dates_re(today, tomorrow)
 
     results_for_all_dates = {}
     processed_dates = set()
@@ -321,19 +322,22 @@ async def main():
     
     for idx, post in enumerate(posts, 1):
         try:
-            # Витягуємо дату з тексту (з debug для останніх постів)
-            debug = (idx >= 10)
-            date_str = extract_date_from_post(post['text'], debug=debug)
+            debug = (idx >= 10)  # Debug тільки для останніх постів
             
-            if not date_str:
-                # Debug: показуємо перші 300 символів тексту поста
-                if idx >= 10:  # Тільки для останніх постів
-                    log(f"📄 Пост {idx}: не знайдено дати в тексті")
-                    log(f"   Початок тексту: {post['text'][:300]}")
-                else:
-                    log(f"📄 Пост {idx}: не знайдено дати в тексті")
+            # Пост без "<число> <місяць>" на сьогодні/завтра далі не розбираємо.
+            # Після цього відсіву extract_date_from_post завжди знаходить дату,
+            # тому окремої гілки "не знайдено дати" немає
+            if not target_dates_re.search(post['text']):
+                message = f"⏭️ Пост {idx}: немає дати на сьогодні/завтра"
+                if debug:
+                    # Debug: показуємо перші 300 символів тексту поста
+                    message += f"\n   Початок тексту: {post['text'][:300]}"
+                log(message)
                 continue
             
+            # Витягуємо дату з тексту
+            date_str = extract_date_from_post(post['text'], year=now.year, debug=debug)
+            
             # Пропускаємо якщо не today/tomorrow
             if date_str not in (today_str, tomorrow_str):
                 log(f"⏭️ Пост {idx}: {date_str} (не сьогодні/завтра)")
@@ -353,19 +357,18 @@ async def main():
                 log(f"⚠️ Пост {idx}: не знайдено графіків у тексті")
                 continue
             
-            # Час оновлення - беремо поточний час
-            current_time = datetime.now(TZ).strftime("%H:%M")
+            # Час оновлення - час початку запуску
+            current_time = now.strftime("%H:%M")
             log(f"🕒 Час оновлення: {current_time}")
             
-            # Створюємо timestamp
-            day_int, month_int, year_int = map(int, date_str.split("."))
-            date_dt = datetime(year_int, month_int, day_int, tzinfo=TZ)
-            date_ts = int(date_dt.timestamp())
-            
-            results_for_all_dates[str(date_ts)] = result
+            results_for_all_dates[date_keys[date_str]] = result
             processed_dates.add(date_str)
             log(f"✅ Додано графік для {date_str}: {len(result)} груп")
             
+            # Обидві дати вже є - наступні пости все одно були б пропущені
+            if len(processed_dates) == len(date_keys):
+                break
+            
         except Exception as e:
             log(f"❌ Помилка обробки поста {idx}: {e}")
             continue
@@ -376,11 +379,11 @@ async def main():
 
     # Перевіряємо DIFF
     if os.path.exists(OUTPUT_FILE):
-        with open(OUTPUT_FILE, "r", encoding="utf-8") as f:
-            old_json = json.load(f)
+        old_json = load_json(OUTPUT_FILE)
         old_data = old_json.get("fact", {}).get("data", {})
 
-        if json.dumps(old_data, sort_keys=True) == json.dumps(results_for_all_dates, sort_keys=True):
+        # Словники порівнюються без урахування порядку ключів - серіалізація не потрібна
+        if old_data == results_for_all_dates:
             log("ℹ️ Дані не змінилися — JSON не оновлюємо")
             return False
 
@@ -388,9 +391,12 @@ async def main():
     update_formatted = datetime.now(TZ).strftime("%d.%m.%Y %H:%M")
     log(f"🕑 Фінальне оновлення: {update_formatted}")
 
-    # Сортуємо дати від меншої до більшої
-    sorted_results = dict(sorted(results_for_all_dates.items(), key=lambda x: int(x[0])))
-    results_for_all_dates = sorted_results
+    # Розставляємо дати від меншої до більшої (сьогодні, завтра)
+    results_for_all_dates = {
+        key: results_for_all_dates[key]
+        for key in date_keys.values()
+        if key in results_for_all_dates
+    }
 
     # Формуємо JSON
     new_json = {
@@ -399,27 +405,14 @@ async def main():
         "fact": {
             "data": results_for_all_dates,
             "update": update_formatted,
-            "today": int(datetime(today.year, today.month, today.day, tzinfo=TZ).timestamp())
+            "today": int(date_keys[today_str])
         },
-        "preset": {
-            "time_zone": {
-                str(i): [f"{i - 1:02d}-{i:02d}", f"{i - 1:02d}:00", f"{i:02d}:00"]
-                for i in range(1, 25)
-            },
-            "time_type": {
-                "yes": "Світло є",
-                "maybe": "Можливе відключення",
-                "no": "Світла немає",
-                "first": "Світла не буде перші 30 хв.",
-                "second": "Світла не буде другі 30 хв"
-            }
-        }
+        "preset": PRESET
     }
 
     # Записуємо JSON
     log(f"💾 Записую JSON → {OUTPUT_FILE}")
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(new_json, f, ensure_ascii=False, indent=2)
+    dump_json(new_json, OUTPUT_FILE)
 
     log("✔️ JSON успішно оновлено")
     return True
@@ -12,17 +12,44 @@ HTML-рендерер зображень через Playwright
 """
 
 import asyncio
-import json
 import os
 import shutil
+import uuid
+from contextlib import asynccontextmanager
 from pathlib import Path
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from playwright.async_api import async_playwright
-from typing import Dict, List, Optional, Tuple
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from .config import config
 from .logger import log
+from .utils import dumps_json, load_json
+
+
+async def _gather_or_cancel(*aws: Awaitable) -> list:
+    """
+    Як asyncio.gather, але при першій помилці скасовує решту задач
+    
+    Незавершені задачі скасовуються і дочікуються до того, як помилка
+    піде далі — щоб закриття браузера чи cleanup_temp() не відбувались
+    під ще активними рендерами.
+    
+    Args:
+        *aws: Корутини для одночасного виконання
+        
+    Returns:
+        list: Результати у порядку аргументів
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
 
 
 class HTMLRenderer:
@@ -34,19 +61,43 @@ class HTMLRenderer:
     - Підтримка світлої теми
     - Автоматична підготовка даних для JavaScript
     - Очищення тимчасових файлів
+    
+    Рендерер можна використовувати як асинхронний контекстний менеджер —
+    тоді один браузер Chromium працює для всіх рендерів:
+    
+        async with HTMLRenderer(json_path) as renderer:
+            await renderer.generate_all_images("light")
     """
     
-    def __init__(self, json_path: str):
+    def __init__(self, json_path: str, max_parallel: Optional[int] = None):
         """
         Ініціалізація HTML рендерера
         
         Args:
             json_path: Шлях до JSON файлу з даними відключень
+            max_parallel: Максимальна кількість одночасних рендерів
+                          (за замовчуванням config.RENDER_CONCURRENCY)
         """
         self.json_path = Path(json_path)
         self.templates_dir = config.TEMPLATES_DIR  # Нова папка templates
         self.output_dir = config.IMAGES_DIR  # Папка output/images
+        self.temp_dir = config.BASE_DIR / "temp_render"
         self.data = self._load_json_data()
+        self.max_parallel = max(1, max_parallel or config.RENDER_CONCURRENCY)
+        
+        # Семафор створюється ліниво всередині event loop (сумісність з Python 3.9)
+        self._render_slots: Optional[asyncio.Semaphore] = None
+        self._assets_staged = False
+        self._schedule_json: Optional[str] = None  # Дані для JS, серіалізовані один раз
+        self._templates: Dict[Path, Tuple[str, str]] = {}  # Шаблони, розділені по </head>: (голова з даними, решта)
+        self._groups: Optional[List[str]] = None  # Список GPV груп (дані не змінюються)
+        
+        # Спільний браузер (запускається в start() або через async with)
+        self._playwright = None
+        self._browser = None
+        self._contexts: Dict[float, object] = {}
+        self._page_pool: Dict[float, List] = {}  # Вільні "теплі" сторінки для кожного масштабу
+        self._context_lock: Optional[asyncio.Lock] = None
         
         # Створюємо вихідну папку якщо її немає
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -54,14 +105,16 @@ class HTMLRenderer:
     def _load_json_data(self) -> dict:
         """Завантажити JSON дані з файлу"""
         try:
-            with open(self.json_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return load_json(self.json_path)
         except Exception as e:
             log(f"Помилка завантаження JSON {self.json_path}: {e}")
             raise
             
     def _get_available_groups(self) -> List[str]:
-        """Отримати список доступних GPV груп з JSON даних"""
+        """Отримати список доступних GPV груп з JSON даних (обчислюється один раз)"""
+        if self._groups is not None:
+            return self._groups
+        
         groups = set()
         
         # Шукаємо групи в fact.data (фактичні дані)
@@ -78,13 +131,146 @@ class HTMLRenderer:
                 if key.startswith('GPV') and '.' in key:
                     groups.add(key)
         
-        return sorted(list(groups))
+        self._groups = sorted(groups)
+        return self._groups
+    
+    async def __aenter__(self) -> "HTMLRenderer":
+        await self.start()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+    
+    @property
+    def is_started(self) -> bool:
+        """Чи запущено спільний браузер"""
+        return self._browser is not None
+    
+    async def start(self) -> None:
+        """Запустити спільний браузер Chromium для всіх наступних рендерів"""
+        if self.is_started:
+            return
+        
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(headless=True)
+        self._context_lock = asyncio.Lock()
+        log("🌐 Браузер Chromium запущено")
+    
+    async def close(self) -> None:
+        """Закрити спільний браузер та всі його контексти"""
+        self._page_pool.clear()
+        for context in self._contexts.values():
+            await context.close()
+        self._contexts.clear()
+        
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        self._context_lock = None
+    
+    async def _get_context(self, scale: float):
+        """Отримати (або створити) спільний контекст браузера для масштабу"""
+        async with self._context_lock:
+            context = self._contexts.get(scale)
+            if context is None:
+                context = await self._browser.new_context(
+                    device_scale_factor=scale,  # Масштаб для високої якості
+                    viewport={'width': 1200, 'height': 800}  # Розмір вікна браузера
+                )
+                self._contexts[scale] = context
+            return context
+    
+    @asynccontextmanager
+    async def _open_page(self, scale: float) -> AsyncIterator:
+        """
+        Відкрити сторінку для рендеру
+        
+        Якщо спільний браузер запущено — сторінка береться з пулу його контексту
+        (або створюється нова) і після рендеру повертається в пул. Розмір пулу
+        не перевищує max_parallel, бо всі рендери проходять через семафор.
+        Інакше браузер запускається лише для цього рендеру.
+        """
+        if self.is_started:
+            pool = self._page_pool.setdefault(scale, [])
+            if pool:
+                page = pool.pop()
+            else:
+                context = await self._get_context(scale)
+                page = await context.new_page()
+            
+            try:
+                yield page
+            except BaseException:
+                # Сторінка могла залишитись у невизначеному стані — не повертаємо її
+                await page.close()
+                raise
+            else:
+                pool.append(page)
+            return
+        
+        async with async_playwright() as p:
+            # Запускаємо браузер Chromium
+            browser = await p.chromium.launch(headless=True)
+            try:
+                context = await browser.new_context(
+                    device_scale_factor=scale,  # Масштаб для високої якості
+                    viewport={'width': 1200, 'height': 800}  # Розмір вікна браузера
+                )
+                yield await context.new_page()
+            finally:
+                await browser.close()
+    
+    def _get_render_slots(self) -> asyncio.Semaphore:
+        """Отримати семафор, що обмежує кількість одночасних рендерів"""
+        if self._render_slots is None:
+            self._render_slots = asyncio.Semaphore(self.max_parallel)
+        return self._render_slots
+    
+    def _stage_assets(self) -> None:
+        """
+        Скопіювати спільні ресурси (CSS, JS, іконки) в тимчасову папку
+        
+        Виконується один раз на рендерер: при паралельному рендерингу повторне
+        копіювання могло б перезаписати файл, який саме читає інший браузер.
+        Дані графіка однакові для всіх шаблонів, тому теж записуються один раз
+        у schedule-data.js, а тимчасові HTML файли лише посилаються на нього.
+        """
+        if self._assets_staged:
+            return
+        
+        self.temp_dir.mkdir(exist_ok=True)
+        
+        # Копіюємо ресурси (CSS та JS файли)
+        css_src = self.templates_dir / "css" / "schedule-shared.css"
+        js_src = self.templates_dir / "js" / "schedule-shared.js"
+        
+        if css_src.exists():
+            shutil.copy2(css_src, self.temp_dir / "schedule-shared.css")
+        if js_src.exists():
+            shutil.copy2(js_src, self.temp_dir / "schedule-shared.js")
+                
+        # Копіюємо іконки
+        icons_dir = self.temp_dir / "icons"
+        icons_dir.mkdir(exist_ok=True)
+        assets_dir = self.templates_dir / "assets"
+        if assets_dir.exists():
+            for icon_file in assets_dir.glob("*.svg"):
+                shutil.copy2(icon_file, icons_dir / icon_file.name)
+        
+        # Дані для JavaScript
+        with open(self.temp_dir / "schedule-data.js", 'w', encoding='utf-8') as f:
+            f.write(f"window.__SCHEDULE__ = {self._get_schedule_json()};\n")
+        
+        self._assets_staged = True
     
     async def _render_template(self, template_name: str, output_path: str, 
                              gpv_key: Optional[str] = None, 
                              theme: str = "light",
                              day: Optional[str] = None,
-                             scale: float = 2.0) -> Tuple[int, int]:
+                             scale: Optional[float] = None) -> Tuple[int, int]:
         """
         Рендерити HTML шаблон в PNG зображення
         
@@ -94,12 +280,14 @@ class HTMLRenderer:
             gpv_key: Ключ GPV групи (наприклад, "GPV1.1")
             theme: Тема оформлення ("light" або "dark")
             day: День для відображення ("today" або "tomorrow")
-            scale: Масштаб рендерингу (1.0 = звичайний, 2.0 = високий DPI)
+            scale: Масштаб рендерингу (1.0 = звичайний, 2.0 = високий DPI;
+                   за замовчуванням config.RENDER_SCALE)
             
         Returns:
             Tuple[int, int]: Ширина та висота згенерованого зображення
         """
         
+        scale = scale or config.RENDER_SCALE
         template_path = self.templates_dir / template_name
         if not template_path.exists():
             raise FileNotFoundError(f"Шаблон не знайдено: {template_path}")
@@ -107,43 +295,39 @@ class HTMLRenderer:
         # Створюємо тимчасовий HTML файл з даними
         temp_html = await self._prepare_template(template_path, gpv_key, theme, day)
         
-        async with async_playwright() as p:
-            # Запускаємо браузер Chromium
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
-                device_scale_factor=scale,  # Масштаб для високої якості
-                viewport={'width': 1200, 'height': 800}  # Розмір вікна браузера
-            )
-            page = await context.new_page()
-            
+        async with self._get_render_slots(), self._open_page(scale) as page:
             try:
-                # Завантажуємо HTML сторінку
-                await page.goto(f"file://{temp_html.absolute()}")
+                # Завантажуємо HTML сторінку (goto чекає події load — стилі та іконки вже завантажені)
+                await page.goto(f"file://{temp_html.absolute()}", timeout=config.RENDER_TIMEOUT)
+                
+                # Чекаємо, доки скрипт шаблону побудує сторінку, та готовності шрифтів
+                await page.wait_for_function("window.__SCHEDULE_READY__ === true", timeout=config.RENDER_TIMEOUT)
+                await page.evaluate("document.fonts.ready.then(() => true)")
                 
-                # Чекаємо повного завантаження
-                await page.wait_for_load_state('networkidle')
-                await page.wait_for_timeout(1000)  # Додаткова пауза для стабільності
+                # Іконки станів додаються як <img decoding="async"> — чекаємо їх декодування,
+                # інакше скріншот може захопити ще порожні іконки
+                await page.evaluate(
+                    "Promise.all([...document.images].map(img => img.decode().catch(() => {})))"
+                )
                 
                 # Знаходимо контейнер для скріншоту
                 container = page.locator('.container')
                 await container.wait_for()
                 
-                # Робимо скріншот
-                screenshot_bytes = await container.screenshot(
+                # Робимо скріншот (PNG кодує Chromium і одразу пише у файл)
+                png = await container.screenshot(
                     path=output_path,
                     type='png'
                 )
                 
-                # Отримуємо розміри зображення
-                box = await container.bounding_box()
-                width = int(box['width'] * scale) if box else 0
-                height = int(box['height'] * scale) if box else 0
+                # Розміри беремо із заголовка IHDR готового PNG — без окремого запиту до браузера
+                width = int.from_bytes(png[16:20], 'big')
+                height = int.from_bytes(png[20:24], 'big')
                 
                 log(f"✅ Рендер завершено: {output_path} ({width}x{height})")
                 return width, height
                 
             finally:
-                await browser.close()
                 # Видаляємо тимчасовий файл
                 if temp_html.exists():
                     temp_html.unlink()
@@ -163,44 +347,32 @@ class HTMLRenderer:
             Path: Шлях до підготовленого тимчасового HTML файлу
         """
         
-        # Читаємо шаблон
-        with open(template_path, 'r', encoding='utf-8') as f:
-            html_content = f.read()
+        # Читаємо шаблон (кожен файл — один раз на рендерер) і одразу розділяємо по </head>:
+        # незмінна частина з підключенням даних готується один раз, на кожен рендер
+        # додаються лише скрипти конкретної групи/дня
+        parts = self._templates.get(template_path)
+        if parts is None:
+            with open(template_path, 'r', encoding='utf-8') as f:
+                head, sep, rest = f.read().partition('</head>')
+            if sep:
+                # Дані — у спільному schedule-data.js
+                head += """
+        <script src="schedule-data.js"></script>
+        """
+            parts = (head, sep + rest)
+            self._templates[template_path] = parts
+        head, rest = parts
             
-        # Створюємо тимчасову папку
-        temp_dir = config.BASE_DIR / "temp_render"
-        temp_dir.mkdir(exist_ok=True)
+        # Створюємо тимчасову папку зі спільними ресурсами
+        self._stage_assets()
         
-        # Копіюємо ресурси (CSS та JS файли)
-        css_src = self.templates_dir / "css" / "schedule-shared.css"
-        js_src = self.templates_dir / "js" / "schedule-shared.js"
-        
-        if css_src.exists():
-            shutil.copy2(css_src, temp_dir / "schedule-shared.css")
-        if js_src.exists():
-            shutil.copy2(js_src, temp_dir / "schedule-shared.js")
-                
-        # Копіюємо іконки
-        icons_dir = temp_dir / "icons"
-        icons_dir.mkdir(exist_ok=True)
-        assets_dir = self.templates_dir / "assets"
-        if assets_dir.exists():
-            for icon_file in assets_dir.glob("*.svg"):
-                shutil.copy2(icon_file, icons_dir / icon_file.name)
-            
-        # Підготовлюємо дані для JavaScript
-        prepared_data = self._prepare_data_for_js()
-            
-        # Додаємо дані в HTML через скрипт
-        data_script = f"""
+        scripts = []
+        if gpv_key:
+            scripts.append(f"""
         <script>
-            window.__SCHEDULE__ = {json.dumps(prepared_data, ensure_ascii=False)};
-            {f'window.__GPV_KEY__ = "{gpv_key}";' if gpv_key else ''}
+            window.__GPV_KEY__ = "{gpv_key}";
         </script>
-        """
-        
-        # Вставляємо скрипт перед закриваючим </head>
-        html_content = html_content.replace('</head>', f'{data_script}</head>')
+        """)
         
         # Додаємо параметри теми та дня в URL через скрипт
         url_params = []
@@ -212,7 +384,7 @@ class HTMLRenderer:
             url_params.append(f"gpv={gpv_key}")
             
         if url_params:
-            params_script = f"""
+            scripts.append(f"""
             <script>
                 // Імітуємо URL параметри
                 const mockUrl = new URL(window.location);
@@ -222,16 +394,32 @@ class HTMLRenderer:
                     writable: false
                 }});
             </script>
-            """
-            html_content = html_content.replace('</head>', f'{params_script}</head>')
+            """)
+        
+        # Скрипти вставляються перед закриваючим </head> (якщо він є)
+        html_content = head + ''.join(scripts) + rest if rest else head
         
-        # Зберігаємо тимчасовий HTML файл
-        temp_html = temp_dir / f"temp_{template_path.stem}_{datetime.now().timestamp()}.html"
+        # Зберігаємо тимчасовий HTML файл (унікальне ім'я для паралельних рендерів)
+        temp_html = self.temp_dir / f"temp_{template_path.stem}_{uuid.uuid4().hex}.html"
         with open(temp_html, 'w', encoding='utf-8') as f:
             f.write(html_content)
             
         return temp_html
     
+    def _get_schedule_json(self) -> str:
+        """
+        Отримати підготовлені для JavaScript дані у вигляді JSON рядка
+        
+        Дані однакові для всіх шаблонів рендерера, тому готуються та
+        серіалізуються лише при першому зверненні.
+        
+        Returns:
+            str: JSON з даними графіка
+        """
+        if self._schedule_json is None:
+            self._schedule_json = dumps_json(self._prepare_data_for_js())
+        return self._schedule_json
+    
     def _prepare_data_for_js(self) -> dict:
         """
         Підготувати дані в форматі, очікуваному JavaScript кодом
@@ -461,27 +649,28 @@ class HTMLRenderer:
             Dict[str, str]: Словник з шляхами до згенерованих файлів
                            {'emergency': path, 'week': path, 'summary': path}
         """
-        results = {}
-        
         log(f"🎨 Генерую всі зображення для {gpv_key} (тема: {theme})")
         
-        # Аварійний графік
-        results['emergency'] = await self.generate_emergency_schedule(gpv_key, theme)
-        
-        # Тижневий графік  
-        results['week'] = await self.generate_week_schedule(gpv_key, theme)
-        
-        # Картка
-        results['summary'] = await self.generate_summary_card(gpv_key, theme)
+        # Три зображення незалежні — рендеримо одночасно (в межах семафора)
+        emergency, week, summary = await _gather_or_cancel(
+            self.generate_emergency_schedule(gpv_key, theme),  # Аварійний графік
+            self.generate_week_schedule(gpv_key, theme),       # Тижневий графік
+            self.generate_summary_card(gpv_key, theme)         # Картка
+        )
         
-        return results
+        return {'emergency': emergency, 'week': week, 'summary': summary}
     
-    async def generate_all_images(self, theme: str = "light") -> Dict[str, any]:
+    async def generate_all_images(self, theme: str = "light",
+                                  on_ready: Optional[Callable[[str, str], Awaitable[None]]] = None
+                                  ) -> Dict[str, any]:
         """
         Генерувати всі зображення
         
         Args:
             theme: Тема оформлення ("light" або "dark")
+            on_ready: Корутина on_ready(kind, path), що викликається щойно
+                      зображення готове (kind: "full", "groups-today",
+                      "groups-tomorrow" або "GPV1.1-emergency" тощо)
             
         Returns:
             Dict[str, any]: Результати генерації:
@@ -495,19 +684,48 @@ class HTMLRenderer:
             'individual': {}
         }
         
-        log(f"🎨 Починаю генерацію всіх зображень (тема: {theme})")
+        log(f"🎨 Починаю генерацію всіх зображень (тема: {theme}, паралельно: {self.max_parallel})")
+        
+        # Всі рендери незалежні — запускаємо їх одночасно,
+        # кількість активних сторінок обмежує семафор у _render_template
+        groups = self._get_available_groups()
         
-        # Повний графік
-        results['full'].append(await self.generate_full_schedule(theme))
+        async def notify(kind: str, job: Awaitable[str]) -> str:
+            path = await job
+            if on_ready:
+                await on_ready(kind, path)
+            return path
         
-        # Матриця груп (сьогодні та завтра)
-        results['groups'].append(await self.generate_groups_matrix("today", theme))
-        results['groups'].append(await self.generate_groups_matrix("tomorrow", theme))
+        async def notify_group(gpv_key: str) -> Dict[str, str]:
+            group_results = await self.generate_all_for_group(gpv_key, theme)
+            if on_ready:
+                for image_type, path in group_results.items():
+                    await on_ready(f"{gpv_key}-{image_type}", path)
+            return group_results
         
-        # Індивідуальні графіки для кожної групи
-        groups = self._get_available_groups()
-        for gpv_key in groups:
-            results['individual'][gpv_key] = await self.generate_all_for_group(gpv_key, theme)
+        # Якщо браузер ще не запущено — запускаємо один на весь прохід
+        owns_browser = not self.is_started
+        if owns_browser:
+            await self.start()
+        
+        try:
+            # При помилці одного рендера решта скасовується ще до закриття браузера
+            full_path, groups_today, groups_tomorrow, *individual = await _gather_or_cancel(
+                # Повний графік
+                notify("full", self.generate_full_schedule(theme)),
+                # Матриця груп (сьогодні та завтра)
+                notify("groups-today", self.generate_groups_matrix("today", theme)),
+                notify("groups-tomorrow", self.generate_groups_matrix("tomorrow", theme)),
+                # Індивідуальні графіки для кожної групи
+                *(notify_group(gpv_key) for gpv_key in groups)
+            )
+        finally:
+            if owns_browser:
+                await self.close()
+        
+        results['full'].append(full_path)
+        results['groups'].extend([groups_today, groups_tomorrow])
+        results['individual'] = dict(zip(groups, individual))
             
         log(f"✅ Генерація завершена! Створено зображень:")
         log(f"   - Повних графіків: {len(results['full'])}")
@@ -518,9 +736,9 @@ class HTMLRenderer:
     
     def cleanup_temp(self):
         """Очистити тимчасові файли"""
-        temp_dir = config.BASE_DIR / "temp_render"
-        if temp_dir.exists():
-            shutil.rmtree(temp_dir)
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+        self._assets_staged = False
 
 
 async def main():
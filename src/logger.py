@@ -4,6 +4,10 @@
 Модуль логування з ротацією файлів для DNIPRO_PARSER
 """
 import os
+import sys
+import atexit
+import queue
+import threading
 import logging
 import logging.handlers
 from datetime import datetime, timedelta
@@ -17,16 +21,30 @@ LOG_LEVEL = config.LOG_LEVEL.upper()
 MAX_LOG_SIZE = int(os.getenv("MAX_LOG_SIZE", "10")) * 1024 * 1024  # МБ в байти
 BACKUP_COUNT = 7  # Зберігати 7 файлів (тиждень)
 TIMEZONE = os.getenv("TIMEZONE", "Europe/Kyiv")
+TZ = ZoneInfo(TIMEZONE)
 
 class UkrainianFormatter(logging.Formatter):
     """Форматер з українською локалізацією"""
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Кеш мітки часу з точністю до секунди: (секунда, формат, рядок)
+        self._time_cache = (None, None, "")
+        self._time_lock = threading.Lock()
+    
     def formatTime(self, record, datefmt=None):
         """Форматувати час з українським часовим поясом"""
-        dt = datetime.fromtimestamp(record.created, ZoneInfo(TIMEZONE))
-        if datefmt:
-            return dt.strftime(datefmt)
-        return dt.strftime("%Y-%m-%d %H:%M:%S")
+        datefmt = datefmt or "%Y-%m-%d %H:%M:%S"
+        second = int(record.created)
+        
+        cached_second, cached_fmt, cached_str = self._time_cache
+        if cached_second == second and cached_fmt == datefmt:
+            return cached_str
+        
+        with self._time_lock:
+            timestamp = datetime.fromtimestamp(second, TZ).strftime(datefmt)
+            self._time_cache = (second, datefmt, timestamp)
+        return timestamp
 
 def setup_logger(name: str, log_file: str = "full_log.log") -> logging.Logger:
     """
@@ -48,6 +66,7 @@ def setup_logger(name: str, log_file: str = "full_log.log") -> logging.Logger:
     logger.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
     
     # Ротаційний файловий хендлер
+    config.LOGS_DIR.mkdir(parents=True, exist_ok=True)
     log_path = config.LOGS_DIR / log_file
     file_handler = logging.handlers.RotatingFileHandler(
         log_path,
@@ -73,6 +92,32 @@ def setup_logger(name: str, log_file: str = "full_log.log") -> logging.Logger:
     
     return logger
 
+def get_file_logger(name: str, path) -> logging.Logger:
+    """
+    Отримати логер, що дописує готові рядки у файл
+    
+    Файл лишається відкритим, але WatchedFileHandler перевідкриває його
+    після ротації (напр. full_log.log, який ротує setup_logger).
+    
+    Args:
+        name: Назва логера
+        path: Шлях до файлу логу
+        
+    Returns:
+        Налаштований логер (записує лише текст повідомлення)
+    """
+    logger = logging.getLogger(name)
+    
+    # Якщо логер вже налаштований, повертаємо його
+    if logger.handlers:
+        return logger
+    
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.addHandler(logging.handlers.WatchedFileHandler(path, encoding='utf-8'))
+    
+    return logger
+
 def cleanup_old_logs(days_to_keep: int = 7):
     """
     Видалити старі лог файли
@@ -112,6 +157,40 @@ def get_log_stats() -> dict:
     except Exception as e:
         return {"error": str(e)}
 
+# Рівні кольорового log(message, level) у скриптах: SUCCESS пишеться як INFO
+SCRIPT_LOG_LEVELS = {"INFO": logging.INFO, "SUCCESS": logging.INFO,
+                     "WARNING": logging.WARNING, "ERROR": logging.ERROR}
+
+def setup_queue_logging(name: str) -> logging.Logger:
+    """
+    Налаштувати логер скрипта, що пише в stdout через чергу
+    
+    Виклики (в т.ч. з паралельних потоків) лише додають запис у чергу,
+    а в stdout пише один фоновий потік QueueListener — рядки не перемішуються.
+    
+    Args:
+        name: Назва логера
+        
+    Returns:
+        Налаштований логер
+    """
+    logger = logging.getLogger(name)
+    
+    # Якщо логер вже налаштований, повертаємо його
+    if logger.handlers:
+        return logger
+    
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+    listener.start()
+    atexit.register(listener.stop)
+    
+    return logger
+
 # Основний логер для проекту
 main_logger = setup_logger("DNIPRO_PARSER")
 
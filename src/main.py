@@ -16,6 +16,32 @@ import src.telegram_updates_monitor as telegram_updates_monitor
 from .schedule_updates_parser import update_schedule_from_message
 
 
+async def render_all_images(json_path) -> int:
+    """
+    Згенерувати всі зображення (світла тема) одним рендерером
+    
+    Args:
+        json_path: Шлях до JSON файлу з графіком
+        
+    Returns:
+        int: Кількість згенерованих зображень
+    """
+    from .html_renderer import HTMLRenderer
+    
+    renderer = HTMLRenderer(str(json_path))
+    try:
+        results = await renderer.generate_all_images("light")
+    finally:
+        # Очищуємо тимчасові файли
+        renderer.cleanup_temp()
+    
+    return (
+        len(results.get('full', []))
+        + len(results.get('groups', []))
+        + sum(len(group_results) for group_results in results.get('individual', {}).values())
+    )
+
+
 def parse_args():
     parser = argparse.ArgumentParser(description="Run Dnipro Oblenergo parser")
     parser.add_argument("--parse", "-p", action="store_true", help="Запустити парсинг Telegram-каналу")
@@ -66,18 +92,8 @@ def main():
                         json_path = config.get_json_path()
                         log(f"▶️ Перегенерация изображений после обновления")
                         
-                        from .html_renderer import HTMLRenderer
-                        renderer = HTMLRenderer(str(json_path))
-                        results = await renderer.generate_all_images("light")
-                        
-                        total_images = 0
-                        total_images += len(results.get('full', []))
-                        total_images += len(results.get('groups', []))
-                        for group_results in results.get('individual', {}).values():
-                            total_images += len(group_results)
-                        
+                        total_images = await render_all_images(json_path)
                         log(f"✔️ Перегенерация завершена - обновлено {total_images} файлов")
-                        renderer.cleanup_temp()
                         return True
                         
                     except Exception as e:
@@ -148,18 +164,8 @@ def main():
                     else:
                         log(f"▶️ Генерация изображений после парсинга")
                     
-                    from .html_renderer import HTMLRenderer
-                    renderer = HTMLRenderer(str(json_path))
-                    results = await renderer.generate_all_images("light")
-                    
-                    total_images = 0
-                    total_images += len(results.get('full', []))
-                    total_images += len(results.get('groups', []))
-                    for group_results in results.get('individual', {}).values():
-                        total_images += len(group_results)
-                    
+                    total_images = await render_all_images(json_path)
                     log(f"✔️ Генерация завершена - создано {total_images} файлов")
-                    renderer.cleanup_temp()
                     return True
                     
                 except Exception as e:
@@ -191,18 +197,8 @@ def main():
                         json_path = config.get_json_path()
                         log(f"▶️ Перегенерация изображений после обновлений")
                         
-                        from .html_renderer import HTMLRenderer
-                        renderer = HTMLRenderer(str(json_path))
-                        results = await renderer.generate_all_images("light")
-                        
-                        total_images = 0
-                        total_images += len(results.get('full', []))
-                        total_images += len(results.get('groups', []))
-                        for group_results in results.get('individual', {}).values():
-                            total_images += len(group_results)
-                        
+                        total_images = await render_all_images(json_path)
                         log(f"✔️ Перегенерация завершена - обновлено {total_images} файлов")
-                        renderer.cleanup_temp()
                         return True
                         
                     except Exception as e:
@@ -239,24 +235,8 @@ def main():
                         json_path = config.get_json_path()
                         log(f"▶️ Запускаю генерацію зображень через HTML рендерер з {json_path}")
                         
-                        # Імпортуємо новий HTML рендерер
-                        from .html_renderer import HTMLRenderer
-                        
-                        # Створюємо рендерер та генеруємо всі зображення
-                        renderer = HTMLRenderer(str(json_path))
-                        results = await renderer.generate_all_images("light")
-                        
-                        # Підраховуємо згенеровані зображення
-                        total_images = 0
-                        total_images += len(results.get('full', []))
-                        total_images += len(results.get('groups', []))
-                        for group_results in results.get('individual', {}).values():
-                            total_images += len(group_results)
-                        
+                        total_images = await render_all_images(json_path)
                         log(f"✔️ Генерація HTML зображень завершена - створено {total_images} файлів")
-                        
-                        # Очищуємо тимчасові файли
-                        renderer.cleanup_temp()
                         return True
                         
                     except Exception as e:
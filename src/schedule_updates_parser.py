@@ -6,7 +6,6 @@
 """
 
 import re
-import json
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from typing import Dict, List, Optional, Tuple
@@ -14,6 +13,7 @@ from pathlib import Path
 
 from .config import config
 from .logger import log
+from .utils import dump_json, load_json
 
 TZ = ZoneInfo("Europe/Kyiv")
 
@@ -273,8 +273,7 @@ def update_schedule_from_message(message_text: str, target_date: Optional[str] =
         return False
     
     try:
-        with open(json_path, "r", encoding="utf-8") as f:
-            json_data = json.load(f)
+        json_data = load_json(json_path)
     except Exception as e:
         log(f"❌ Ошибка чтения JSON файла: {e}")
         return False
@@ -293,8 +292,7 @@ def update_schedule_from_message(message_text: str, target_date: Optional[str] =
     
     # Сохраняем обновленный JSON
     try:
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(json_data, f, ensure_ascii=False, indent=2)
+        dump_json(json_data, json_path)
         log(f"✅ График обновлен и сохранен в {json_path}")
         return True
     except Exception as e:
@@ -1,32 +1,81 @@
 import requests
+import atexit
 import os
-import json
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from dotenv import load_dotenv
 
+from .config import config
+from .logger import get_file_logger
+from .utils import load_json
+
 # --- Завантажуємо .env ---
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))  # вихід із /src
 ENV_PATH = os.path.join(BASE_DIR, ".env")
 load_dotenv(ENV_PATH)
 
+TZ = ZoneInfo("Europe/Kyiv")
+
+# Стани години, що означають відключення (повне або на півгодини)
+OUTAGE_STATES = frozenset(("no", "first", "second"))
+
+# Підписи загальних графіків для каналу: kind -> (підпис, зі статистикою).
+# Порядок ключів — порядок відправки (спершу повний графік зі статистикою)
+SCHEDULE_CAPTIONS = {
+    "full": ("📊 <b>Повний графік відключень</b> ☀️\n\nСьогодні/завтра + тижневий прогноз", True),
+    "groups-today": ("📊 <b>Всі групи на сьогодні</b> ☀️\n\nМатриця відключень по всіх групах", False),
+    "groups-tomorrow": ("📊 <b>Всі групи на завтра</b> ☀️\n\nМатриця відключень по всіх групах", False),
+}
+
+# Назви місяців у родовому відмінку ("19 грудня")
+MONTHS_GENITIVE = (
+    "січня", "лютого", "березня", "квітня", "травня", "червня",
+    "липня", "серпня", "вересня", "жовтня", "листопада", "грудня",
+)
+
 TOKEN = os.getenv("BOT_TOKEN")
 CHAT_ID = os.getenv("ADMIN_CHAT_ID")
 
+# --- HTTP-сесія ---
+# Спільна сесія: з'єднання з api.telegram.org перевикористовується без нового TLS-рукостискання на кожен запит
+API_TIMEOUT = 30
+SESSION = requests.Session()
+atexit.register(SESSION.close)
+
+# --- Дані графіка ---
+# Розібраний графік: (mtime_ns, data) — повторні відправки не перечитують незмінений файл
+_SCHEDULE_CACHE = None
+
 # --- Логи ---
 LOG_DIR = os.path.join(BASE_DIR, "logs")
 os.makedirs(LOG_DIR, exist_ok=True)
 LOG_FILE = os.path.join(LOG_DIR, "telegram_notify.log")
 FULL_LOG_FILE = os.path.join(LOG_DIR, "full_log.log")
 
+# Рядки логу дописуються у full_log.log (з урахуванням його ротації; запис потокобезпечний)
+_file_log = get_file_logger("telegram_notify.full_log", FULL_LOG_FILE)
+
 def log(message):
-    timestamp = datetime.now(ZoneInfo("Europe/Kyiv")).strftime("%Y-%m-%d %H:%M:%S")
+    timestamp = datetime.now(TZ).strftime("%Y-%m-%d %H:%M:%S")
     line = f"{timestamp} [telegram_notify] {message}"
     print(line)
     #with open(LOG_FILE, "a", encoding="utf-8") as f:
     #    f.write(line + "\n")
-    with open(FULL_LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(line + "\n")
+    _file_log.info(line)
+
+
+def load_schedule():
+    """Завантажити графік з config.get_json_path() (розбирається один раз на версію файлу)"""
+    global _SCHEDULE_CACHE
+    json_path = config.get_json_path()
+    mtime = json_path.stat().st_mtime_ns
+    cached = _SCHEDULE_CACHE
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    data = load_json(json_path)
+    _SCHEDULE_CACHE = (mtime, data)
+    return data
 
 
 def calculate_daily_stats(data, day_key):
@@ -57,7 +106,7 @@ def calculate_daily_stats(data, day_key):
             hour_key = str(hour)
             status = group_hours.get(hour_key, "yes")
             
-            if status in ["no", "first", "second"]:  # Відключення
+            if status in OUTAGE_STATES:  # Відключення
                 outage_hours += 1
                 if current_outage_start is None:
                     current_outage_start = hour - 1  # 0-23 для відображення
@@ -114,7 +163,7 @@ def calculate_daily_stats(data, day_key):
 def find_next_outage(data, day_key, current_hour=None):
     """Знайти наступне відключення"""
     if current_hour is None:
-        current_hour = datetime.now(ZoneInfo("Europe/Kyiv")).hour
+        current_hour = datetime.now(TZ).hour
     
     if "fact" not in data or "data" not in data["fact"]:
         return None
@@ -131,7 +180,7 @@ def find_next_outage(data, day_key, current_hour=None):
             hour_key = str(hour)
             status = group_hours.get(hour_key, "yes")
             
-            if status in ["no", "first", "second"]:
+            if status in OUTAGE_STATES:
                 # Знайшли початок відключення, тепер знаходимо кінець
                 start_hour = hour - 1  # 0-23 для відображення
                 end_hour = start_hour
@@ -141,7 +190,7 @@ def find_next_outage(data, day_key, current_hour=None):
                 for next_hour in range(hour + 1, 25):
                     next_hour_key = str(next_hour)
                     next_status = group_hours.get(next_hour_key, "yes")
-                    if next_status in ["no", "first", "second"]:
+                    if next_status in OUTAGE_STATES:
                         end_hour = next_hour - 1
                         duration += 1
                     else:
@@ -178,8 +227,8 @@ def create_stats_message(data, day_key):
         return "❌ Не вдалося розрахувати статистику"
     
     # Дата
-    dt = datetime.fromtimestamp(int(day_key), ZoneInfo("Europe/Kyiv"))
-    date_str = f"{dt.day} грудня"
+    dt = datetime.fromtimestamp(int(day_key), TZ)
+    date_str = f"{dt.day} {MONTHS_GENITIVE[dt.month - 1]}"
     
     message = f"📊 <b>Статистика на {date_str}:</b>\n\n"
     message += f"⚡ <b>Світло є:</b> {stats['avg_available_hours']} годин (в середньому)\n"
@@ -224,13 +273,9 @@ def send_photo(image_path, caption=None, with_stats=True):
         # Якщо потрібно додати статистику
         if with_stats and caption:
             # Спробуємо завантажити JSON для статистики
-            json_dir = os.path.join(BASE_DIR, "out")
-            json_files = [f for f in os.listdir(json_dir) if f.endswith('.json')]
-            if json_files:
-                json_path = os.path.join(json_dir, json_files[0])  # Беремо перший JSON
+            if config.get_json_path().exists():
                 try:
-                    with open(json_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
+                    data = load_schedule()
                     
                     # Знаходимо сьогоднішню дату
                     fact_data = data.get("fact", {}).get("data", {})
@@ -252,7 +297,7 @@ def send_photo(image_path, caption=None, with_stats=True):
                 "parse_mode": "HTML",
                 "disable_notification": False  # Увімкнути звук
             }
-            requests.post(url, data=data_params, files={"photo": img})
+            SESSION.post(url, data=data_params, files={"photo": img}, timeout=API_TIMEOUT)
         
         caption_short = (caption or "").replace("\n", " ")[:100] + "..." if len(caption or "") > 100 else (caption or "")
         log(f"✅ Відправлено фото: {image_path} з підписом: {caption_short}")
@@ -273,7 +318,7 @@ def send_error(text, urgent=True):
             "parse_mode": "HTML",
             "disable_notification": not urgent  # Звук тільки для термінових помилок
         }
-        requests.post(url, data=data)
+        SESSION.post(url, data=data, timeout=API_TIMEOUT)
         log(f"⚠️ Відправлено помилку: {text}")
 
     except Exception as e:
@@ -292,7 +337,7 @@ def send_message(text, urgent=False):
             "parse_mode": "HTML",
             "disable_notification": not urgent  # Звук тільки для термінових повідомлень
         }
-        requests.post(url, data=data)
+        SESSION.post(url, data=data, timeout=API_TIMEOUT)
         log(f"Відправлено повідомлення: {text}")
 
     except Exception as e:
@@ -301,15 +346,11 @@ def send_message(text, urgent=False):
 def send_stats_only():
     """Відправити тільки статистику без зображення"""
     try:
-        json_dir = os.path.join(BASE_DIR, "out")
-        json_files = [f for f in os.listdir(json_dir) if f.endswith('.json')]
-        if not json_files:
+        if not config.get_json_path().exists():
             send_message("❌ Немає даних для статистики")
             return
         
-        json_path = os.path.join(json_dir, json_files[0])
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_schedule()
         
         fact_data = data.get("fact", {}).get("data", {})
         if not fact_data:
@@ -6,7 +6,6 @@
 """
 
 import asyncio
-import json
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from playwright.async_api import async_playwright
@@ -14,6 +13,7 @@ from pathlib import Path
 
 from .config import config
 from .logger import log
+from .utils import dump_json, load_json
 from .schedule_updates_parser import is_update_message, update_schedule_from_message
 
 TZ = ZoneInfo("Europe/Kyiv")
@@ -102,8 +102,7 @@ def load_last_processed_message() -> dict:
         return {"last_id": None, "last_date": None}
     
     try:
-        with open(LAST_MESSAGE_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return load_json(LAST_MESSAGE_FILE)
     except Exception as e:
         log(f"⚠️ Ошибка чтения файла последнего сообщения: {e}")
         return {"last_id": None, "last_date": None}
@@ -117,8 +116,8 @@ def save_last_processed_message(post_id: str, post_date: str):
             "last_date": post_date,
             "processed_at": datetime.now(TZ).isoformat()
         }
-        with open(LAST_MESSAGE_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        config.ensure_directories()
+        dump_json(data, LAST_MESSAGE_FILE)
     except Exception as e:
         log(f"⚠️ Ошибка сохранения файла последнего сообщения: {e}")
 
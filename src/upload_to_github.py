@@ -3,6 +3,7 @@ import os
 import shutil
 import subprocess
 import json
+import sys
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from pathlib import Path
@@ -11,6 +12,10 @@ from pathlib import Path
 REGION = "Dneproblenergo"   # <<<<<<<<<<<<<<<<<< ОБЛЕНЕРГО
 BASE_DIR = Path(__file__).parent.parent.absolute()
 
+# Скрипт запускається і напряму (python src/upload_to_github.py) — додаємо корінь проекту в шлях
+sys.path.insert(0, str(BASE_DIR))
+from src.logger import get_file_logger
+
 #SOURCE_JSON = os.path.join(BASE_DIR, "out", f"{REGION}.json")
 SOURCE_JSON = os.path.join(BASE_DIR, "out", "Dneproblenergo.json")
 SOURCE_IMAGES = os.path.join(BASE_DIR, "out/images")
@@ -23,17 +28,24 @@ IMAGES_DIR = os.path.join(REPO_DIR, f"images/{REGION}") # папка для зо
 #METADATA_FILE = os.path.join(DATA_DIR, f"last_updated_{REGION}.json")
 
 LOG_FILE = os.path.join(BASE_DIR, "logs", "full_log.log")
+TZ = ZoneInfo("Europe/Kyiv")
+
+
+# Рядки логу дописуються у full_log.log (з урахуванням його ротації);
+# якщо папка логів недоступна — пишемо лише в консоль
+try:
+    os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
+    _file_log = get_file_logger("upload_to_github_new.full_log", LOG_FILE)
+except OSError:
+    _file_log = None
 
 
 def log(message):
-    timestamp = datetime.now(ZoneInfo("Europe/Kyiv")).strftime("%Y-%m-%d %H:%M:%S")
-    text = f"{timestamp} [upload_to_github_new] {message}"
-    print(text)
-    try:
-        with open(LOG_FILE, "a", encoding="utf-8") as f:
-            f.write(text + "\n")
-    except:
-        pass
+    timestamp = datetime.now(TZ).strftime("%Y-%m-%d %H:%M:%S")
+    line = f"{timestamp} [upload_to_github_new] {message}"
+    print(line)
+    if _file_log is not None:
+        _file_log.info(line)
 
 
 def run_upload():
@@ -64,7 +76,7 @@ def run_upload():
         log("⚠️ Папка з новими зображеннями не знайдена")
 
     # ------------------- last_updated -------------------
-    current_time = datetime.now(ZoneInfo('Europe/Kyiv'))
+    current_time = datetime.now(TZ)
     #with open(METADATA_FILE, "w", encoding="utf-8") as f:
     #    json.dump({
     #        "region": REGION,
@@ -1,7 +1,49 @@
 from datetime import datetime, timedelta
+import json
 import os
 from typing import List
 
+# orjson опціональний: швидше читає і записує JSON з графіками
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def load_json(path):
+    """
+    Прочитати JSON файл (через orjson, якщо він встановлений)
+
+    path: шлях до файлу
+    """
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def dump_json(obj, path):
+    """
+    Записати JSON файл з відступом 2 (через orjson, якщо він встановлений)
+
+    obj: дані для запису
+    path: шлях до файлу
+    """
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2)
+
+
+def dumps_json(obj) -> str:
+    """Серіалізувати дані в компактний JSON рядок (через orjson, якщо він встановлений)"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False)
+
 def clean_log(log_file_path: str, days: int = 7):
     """
     Очищає лог-файл, видаляючи записи старше `days` днів.
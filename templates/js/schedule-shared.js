@@ -34,20 +34,31 @@
     return firstGpv || 'GPV1.2';
   }
 
+  /**
+   * Таблиці відповідності стану комірки та шляху до файлу іконки
+   * Будуються один раз; для таблиці "Сьогодні" позначки півгодини мають інший набір іконок
+   */
+  const STATE_ICONS = Object.freeze({
+    no: 'icons/no.svg',
+    maybe: 'icons/maybe.svg',
+    first: 'icons/mfirst.svg',
+    mfirst: 'icons/mfirst.svg',
+    second: 'icons/msecond.svg',
+    msecond: 'icons/msecond.svg'
+  });
+  const STATE_ICONS_TODAY = Object.freeze(Object.assign({}, STATE_ICONS, {
+    first: 'icons/nfirst.svg',
+    mfirst: 'icons/nfirst.svg',
+    second: 'icons/nsecond.svg',
+    msecond: 'icons/nsecond.svg'
+  }));
+
   /**
    * Відображення стану комірки на шлях до файлу іконки
    * Використовується для тижневих графіків
    */
   function stateIconSrc(state) {
-    switch (state) {
-      case 'no': return 'icons/no.svg';
-      case 'maybe': return 'icons/maybe.svg';
-      case 'mfirst':
-      case 'first': return 'icons/mfirst.svg';
-      case 'msecond':
-      case 'second': return 'icons/msecond.svg';
-      default: return null;
-    }
+    return STATE_ICONS[state] || null;
   }
 
   /**
@@ -55,9 +66,62 @@
    * Використовується для аварійних графіків та матриць груп
    */
   function stateIconSrcToday(state) {
-    if (state === 'mfirst' || state === 'first') return 'icons/nfirst.svg';
-    if (state === 'msecond' || state === 'second') return 'icons/nsecond.svg';
-    return stateIconSrc(state);
+    return STATE_ICONS_TODAY[state] || null;
+  }
+
+  /**
+   * Форматер дати в часовій зоні Europe/Kyiv
+   * Створення Intl.DateTimeFormat дороге, тому кожен набір опцій створюється один раз
+   */
+  const dateFormatCache = new Map();
+  function kyivDateFormat(locale, options) {
+    const key = locale + JSON.stringify(options);
+    let fmt = dateFormatCache.get(key);
+    if (!fmt) {
+      fmt = new Intl.DateTimeFormat(locale, Object.assign({ timeZone: 'Europe/Kyiv' }, options));
+      dateFormatCache.set(key, fmt);
+    }
+    return fmt;
+  }
+
+  /**
+   * Іконка стану для комірки таблиці
+   * Елемент з усіма атрибутами створюється один раз для кожної іконки, далі копіюється
+   */
+  const cellIconCache = new Map();
+  function cellIcon(src) {
+    let proto = cellIconCache.get(src);
+    if (!proto) {
+      proto = document.createElement('img');
+      proto.className = 'cell-icon';
+      proto.src = src;
+      proto.width = 20; proto.height = 20; proto.alt = ''; proto.setAttribute('aria-hidden', 'true'); proto.decoding = 'async';
+      cellIconCache.set(src, proto);
+    }
+    return proto.cloneNode(false);
+  }
+
+  /**
+   * Додавання заголовків годин до рядка шапки таблиці
+   * Комірки для набору підписів будуються один раз, далі рядок отримує їх копію
+   */
+  const hourHeaderCache = new Map();
+  function appendHourHeaders(row, labels) {
+    const key = labels.join('|');
+    let fragment = hourHeaderCache.get(key);
+    if (!fragment) {
+      fragment = document.createDocumentFragment();
+      for (const t of labels) {
+        const th = document.createElement('th');
+        const div = document.createElement('div');
+        div.className = 'vlabel';
+        div.textContent = t;
+        th.appendChild(div);
+        fragment.appendChild(th);
+      }
+      hourHeaderCache.set(key, fragment);
+    }
+    row.appendChild(fragment.cloneNode(true));
   }
 
   // ===== Допоміжні функції для відображення часових міток оновлення на колонки таблиці =====
@@ -88,11 +152,27 @@
     return NaN;
   }
 
+  /**
+   * Відсортовані номери годин з preset.time_zone
+   * Обчислюються один раз для об'єкта time_zone і спільні для всіх таблиць сторінки
+   */
+  const hourKeysCache = new WeakMap();
+  function sortedHourKeys(preset) {
+    const timeZone = preset?.time_zone;
+    if (!timeZone) return [];
+    let keys = hourKeysCache.get(timeZone);
+    if (!keys) {
+      keys = Object.freeze(Object.keys(timeZone).map(Number).sort((a, b) => a - b));
+      hourKeysCache.set(timeZone, keys);
+    }
+    return keys;
+  }
+
   /**
    * Побудова масиву часових міток з preset даних
    */
   function buildStartsMinutesFromPreset(preset) {
-    const tzKeys = Object.keys(preset?.time_zone || {}).map(Number).sort((a, b) => a - b);
+    const tzKeys = sortedHourKeys(preset);
     const labels = tzKeys.map(k => preset.time_zone[String(k)]?.[0] || '');
     const starts = labels.map(parseTimeLabelStartMinutes);
     return { tzKeys, starts };
@@ -127,7 +207,7 @@
       try {
         // Поточний рік в часовій зоні Europe/Kyiv
         const now = new Date();
-        const parts = new Intl.DateTimeFormat('en-CA', { timeZone: 'Europe/Kyiv', year: 'numeric' }).formatToParts(now);
+        const parts = kyivDateFormat('en-CA', { year: 'numeric' }).formatToParts(now);
         yyyy = Number(parts.find(p => p.type === 'year')?.value) || now.getFullYear();
       } catch (_) { yyyy = new Date().getFullYear(); }
     }
@@ -173,18 +253,19 @@
     if (!Number.isFinite(colIdx) || colIdx < 0) return;
     const table = document.getElementById(tableId);
     if (!table) return;
-    const theadRow = table.querySelector('thead tr');
+    // Комірки беремо за індексом через rows/cells, без вибірки селекторами для кожного рядка
+    const theadRow = table.tHead?.rows[0];
     if (theadRow) {
-      const ths = theadRow.querySelectorAll('th');
-      const th = ths[1 + colIdx]; // +1 через кутову комірку заголовка рядка
+      const th = theadRow.cells[1 + colIdx]; // +1 через кутову комірку заголовка рядка
       if (th) th.classList.add(className);
     }
-    const rows = table.querySelectorAll('tbody tr');
-    rows.forEach(tr => {
-      const tds = tr.querySelectorAll('td');
-      const td = tds[colIdx];
-      if (td) td.classList.add(className);
-    });
+    for (const tbody of table.tBodies) {
+      for (const tr of tbody.rows) {
+        const offset = tr.cells[0]?.tagName === 'TH' ? 1 : 0; // заголовок рядка
+        const td = tr.cells[colIdx + offset];
+        if (td && td.tagName === 'TD') td.classList.add(className);
+      }
+    }
   }
 
   async function loadData() {
@@ -280,7 +361,7 @@
       const epoch = data?.fact?.today;
       if (epoch != null) {
         const baseDate = new Date(Number(epoch) * 1000);
-        const w = new Intl.DateTimeFormat('en-GB', { timeZone: 'Europe/Kyiv', weekday: 'short' }).format(baseDate);
+        const w = kyivDateFormat('en-GB', { weekday: 'short' }).format(baseDate);
         const map = { Mon: 1, Tue: 2, Wed: 3, Thu: 4, Fri: 5, Sat: 6, Sun: 7 };
         todayIdx = map[w] || null;
       }
@@ -293,8 +374,10 @@
     if (!table) return;
     table.innerHTML = '';
 
-    const tzKeys = Object.keys(preset.time_zone).map(Number).sort((a, b) => a - b);
-    const times = tzKeys.map(k => preset.time_zone[String(k)][0]);
+    const tzKeys = sortedHourKeys(preset);
+    const hourKeys = tzKeys.map(String);
+    // One label array for the header row and the cell titles
+    const times = hourKeys.map(k => preset.time_zone[k]?.[0] || '');
 
     const dayKeys = Object.keys(preset.days).map(Number).sort((a, b) => a - b);
 
@@ -305,14 +388,7 @@
     corner.innerHTML = 'Часові<br>проміжки';
     hr.appendChild(corner);
 
-    for (const t of times) {
-      const th = document.createElement('th');
-      const div = document.createElement('div');
-      div.className = 'vlabel';
-      div.textContent = t;
-      th.appendChild(div);
-      hr.appendChild(th);
-    }
+    appendHourHeaders(hr, times);
     thead.appendChild(hr);
 
     const tbody = document.createElement('tbody');
@@ -339,21 +415,18 @@
       const th = document.createElement('th');
       th.textContent = dayName; tr.appendChild(th);
 
-      tzKeys.forEach(hk => {
+      const daySchedule = schedule?.[String(dk)];
+      hourKeys.forEach((hk, i) => {
         const td = document.createElement('td');
-        const value = schedule?.[String(dk)]?.[String(hk)];
+        const value = daySchedule?.[hk];
         if (value) {
           td.classList.add('state-' + value);
-          const timeLabel = preset.time_zone[String(hk)]?.[0] || '';
+          const timeLabel = times[i];
           const desc = preset.time_type?.[value] || value;
           td.title = dayName + ' ' + timeLabel + ' — ' + desc;
           const iconSrc = stateIconSrc(value);
           if (iconSrc) {
-            const img = document.createElement('img');
-            img.className = 'cell-icon';
-            img.src = iconSrc;
-            img.width = 20; img.height = 20; img.alt = ''; img.setAttribute('aria-hidden', 'true'); img.decoding = 'async';
-            td.appendChild(img);
+            td.appendChild(cellIcon(iconSrc));
           }
         }
         tr.appendChild(td);
@@ -373,21 +446,16 @@
     if (!table) return;
     table.innerHTML = '';
 
-    const tzKeys = Object.keys(preset.time_zone).map(Number).sort((a, b) => a - b);
+    const tzKeys = sortedHourKeys(preset);
 
     const thead = document.createElement('thead');
     const hr = document.createElement('tr');
     const corner = document.createElement('th');
     corner.innerHTML = 'Часові<br>проміжки';
     hr.appendChild(corner);
-    for (const hk of tzKeys) {
-      const th = document.createElement('th');
-      const div = document.createElement('div');
-      div.className = 'vlabel';
-      div.textContent = preset.time_zone[String(hk)]?.[0] || '';
-      th.appendChild(div);
-      hr.appendChild(th);
-    }
+    const hourKeys = tzKeys.map(String);
+    const timeLabels = hourKeys.map(k => preset.time_zone[k]?.[0] || '');
+    appendHourHeaders(hr, timeLabels);
     thead.appendChild(hr);
 
     function renderRow(label, dayEpoch) {
@@ -399,20 +467,16 @@
       const dayObj = fact && fact.data && (dayEpoch != null) && fact.data[String(dayEpoch)];
       const schedule = dayObj && (dayObj[gpvKey]);
 
-      tzKeys.forEach(hk => {
+      hourKeys.forEach((hk, i) => {
         const td = document.createElement('td');
-        const raw = schedule?.[String(hk)];
+        const raw = schedule?.[hk];
         if (raw) td.classList.add('state-' + raw);
-        const timeLabel = preset.time_zone[String(hk)]?.[0] || '';
+        const timeLabel = timeLabels[i];
         const desc = raw ? (preset.time_type?.[raw] || raw) : '';
         if (desc) td.title = label + ' ' + timeLabel + ' — ' + desc;
         const iconSrc = raw ? stateIconSrcToday(raw) : null;
         if (iconSrc) {
-          const img = document.createElement('img');
-          img.className = 'cell-icon';
-          img.src = iconSrc;
-          img.width = 20; img.height = 20; img.alt = ''; img.setAttribute('aria-hidden', 'true'); img.decoding = 'async';
-          td.appendChild(img);
+          td.appendChild(cellIcon(iconSrc));
         }
         tr.appendChild(td);
       });
@@ -425,7 +489,7 @@
     function formatUkDate(epochSec) {
       try {
         const d = new Date(Number(epochSec) * 1000);
-        return new Intl.DateTimeFormat('uk-UA', { timeZone: 'Europe/Kyiv', day: 'numeric', month: 'long' }).format(d);
+        return kyivDateFormat('uk-UA', { day: 'numeric', month: 'long' }).format(d);
       } catch (_) { return ''; }
     }
 
@@ -462,8 +526,9 @@
     if (!table) return;
     table.innerHTML = '';
 
-    const tzKeys = Object.keys(preset.time_zone).map(Number).sort((a, b) => a - b);
-    const times = tzKeys.map(k => preset.time_zone[String(k)]?.[0] || '');
+    const tzKeys = sortedHourKeys(preset);
+    const hourKeys = tzKeys.map(String);
+    const times = hourKeys.map(k => preset.time_zone[k]?.[0] || '');
 
     // Determine target epoch and the set of groups present
     const epochStr = (targetEpoch != null) ? String(targetEpoch) : ((fact && fact.today != null) ? String(fact.today) : null);
@@ -480,14 +545,7 @@
     corner.className = 'corner-split';
     corner.innerHTML = '<span class="corner-top">Час</span><span class="corner-bottom">Черга</span>';
     hr.appendChild(corner);
-    for (const t of times) {
-      const th = document.createElement('th');
-      const div = document.createElement('div');
-      div.className = 'vlabel';
-      div.textContent = t;
-      th.appendChild(div);
-      hr.appendChild(th);
-    }
+    appendHourHeaders(hr, times);
     thead.appendChild(hr);
 
     const tbody = document.createElement('tbody');
@@ -512,21 +570,18 @@
       th.textContent = names[gpvKey] || gpvKey.replace(/^GPV/, 'Черга ');
       tr.appendChild(th);
 
-      tzKeys.forEach(hk => {
+      const groupSchedule = dayObj?.[gpvKey];
+      hourKeys.forEach((hk, i) => {
         const td = document.createElement('td');
-        const raw = dayObj?.[gpvKey]?.[String(hk)];
+        const raw = groupSchedule?.[hk];
         if (raw) td.classList.add('state-' + raw);
-        const timeLabel = preset.time_zone[String(hk)]?.[0] || '';
+        const timeLabel = times[i];
         const desc = raw ? (preset.time_type?.[raw] || raw) : '';
         if (desc) td.title = (names[gpvKey] || gpvKey) + ' ' + timeLabel + ' — ' + desc;
         // For groups template, use the 'nfirst/nsecond' icons like in the Today table
         const iconSrc = raw ? stateIconSrcToday(raw) : null;
         if (iconSrc) {
-          const img = document.createElement('img');
-          img.className = 'cell-icon';
-          img.src = iconSrc;
-          img.width = 20; img.height = 20; img.alt = ''; img.setAttribute('aria-hidden', 'true'); img.decoding = 'async';
-          td.appendChild(img);
+          td.appendChild(cellIcon(iconSrc));
         }
         tr.appendChild(td);
       });
@@ -600,12 +655,12 @@
     if (dateEl && Number.isFinite(todayEpoch)) {
       try {
         const d = new Date(todayEpoch * 1000);
-        const longDate = new Intl.DateTimeFormat('uk-UA', { timeZone: 'Europe/Kyiv', day: 'numeric', month: 'long' }).format(d);
+        const longDate = kyivDateFormat('uk-UA', { day: 'numeric', month: 'long' }).format(d);
         if (longDate) dateEl.textContent = `${longDate},`;
       } catch (_) { }
     }
 
-    const tzKeys = Object.keys(preset.time_zone || {}).map(Number).sort((a, b) => a - b);
+    const tzKeys = sortedHourKeys(preset);
     const labels = tzKeys.map(k => preset.time_zone[String(k)]?.[0] || '');
 
     // Parse time label to start minutes (00:00 = 0)
@@ -800,7 +855,20 @@
     tn.nodeValue = `${txt.trim()} ${marker}`;
   }
 
+  /**
+   * Ініціалізація сторінки шаблону
+   * Після побудови (навіть невдалої) виставляє window.__SCHEDULE_READY__ = true —
+   * рендерер чекає на цей прапорець замість фіксованої паузи
+   */
   async function scheduleInit(options) {
+    try {
+      await buildPage(options);
+    } finally {
+      window.__SCHEDULE_READY__ = true;
+    }
+  }
+
+  async function buildPage(options) {
     const mode = (options && options.mode) || 'auto';
     const dayOption = (options && options.day) || 'today'; // 'today' or 'tomorrow'
     initThemeFromQuery();
@@ -818,29 +886,30 @@
     // lastUpdated/meta only if such elements exist (full template)
     injectLastUpdatedIfPresent(data);
 
-    // For groups mode: replace word "сьогодні" with full date (e.g., "8 листопада") and remove short (DD.MM)
-    if (mode === 'groups') {
+    // Target day for the groups matrix: today, or the next available day for day=tomorrow.
+    // Computed once and shared by the title rewrite and buildGroups below.
+    const todayEpoch = (data && data.fact && data.fact.today != null) ? Number(data.fact.today) : null;
+    let targetEpoch = todayEpoch;
+    if (mode === 'groups' && dayOption === 'tomorrow') {
+      // Find next available day after today
       try {
-        const todayEpoch = (data && data.fact && data.fact.today != null) ? Number(data.fact.today) : null;
-        let targetEpoch = todayEpoch;
-
-        if (dayOption === 'tomorrow') {
-          // Find next available day after today
-          try {
-            const keys = Object.keys(data?.fact?.data || {}).map(Number).filter(n => !Number.isNaN(n));
-            if (keys.length) {
-              const greater = keys.filter(k => todayEpoch != null ? k > todayEpoch : true).sort((a, b) => a - b);
-              const nextDay = greater[0] ?? keys.find(k => k !== todayEpoch) ?? null;
-              if (nextDay != null) targetEpoch = nextDay;
-            }
-          } catch (_) { }
+        const keys = Object.keys(data?.fact?.data || {}).map(Number).filter(n => !Number.isNaN(n));
+        if (keys.length) {
+          const greater = keys.filter(k => todayEpoch != null ? k > todayEpoch : true).sort((a, b) => a - b);
+          const nextDay = greater[0] ?? keys.find(k => k !== todayEpoch) ?? null;
+          if (nextDay != null) targetEpoch = nextDay;
         }
+      } catch (_) { }
+    }
 
+    // For groups mode: replace word "сьогодні" with full date (e.g., "8 листопада") and remove short (DD.MM)
+    if (mode === 'groups') {
+      try {
         let longDate = '';
         if (Number.isFinite(targetEpoch)) {
           try {
             const d = new Date(targetEpoch * 1000);
-            longDate = new Intl.DateTimeFormat('uk-UA', { timeZone: 'Europe/Kyiv', day: 'numeric', month: 'long' }).format(d);
+            longDate = kyivDateFormat('uk-UA', { day: 'numeric', month: 'long' }).format(d);
           } catch (_) { longDate = ''; }
         }
         if (longDate) {
@@ -927,29 +996,8 @@
     }
 
     if ((mode === 'groups' || mode === 'auto') && hasMatrix) {
-      // Pass the determined targetEpoch (if we are in groups mode and calculated it)
-      // If mode is auto, we default to today (which is what targetEpoch is init to if not 'tomorrow')
-      // But we need to make sure we calculated targetEpoch above.
-      // The block above runs `if (mode === 'groups')`.
-      // Let's recalculate targetEpoch if needed or scope it better.
-      // For safety, let's just re-derive if not set, or move the logic up.
-      // Actually, let's just duplicate the simple logic here or assume 'today' if not 'groups' mode.
-
-      let effectiveEpoch = (data && data.fact && data.fact.today != null) ? Number(data.fact.today) : null;
-      if (mode === 'groups' && dayOption === 'tomorrow') {
-        // Re-find next available day
-        try {
-          const keys = Object.keys(data?.fact?.data || {}).map(Number).filter(n => !Number.isNaN(n));
-          const t = (data && data.fact && data.fact.today != null) ? Number(data.fact.today) : null;
-          if (keys.length) {
-            const greater = keys.filter(k => t != null ? k > t : true).sort((a, b) => a - b);
-            const nextDay = greater[0] ?? keys.find(k => k !== t) ?? null;
-            if (nextDay != null) effectiveEpoch = nextDay;
-          }
-        } catch (_) { }
-      }
-
-      buildGroups(data.preset, data.fact, effectiveEpoch);
+      // targetEpoch is today unless groups mode asked for tomorrow (resolved above)
+      buildGroups(data.preset, data.fact, targetEpoch);
       injectMetaIfPresent(data);
       return;
     }
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Тести розбору постів ЦЕК у dnipro_telegram_parser
+
+Перевіряють:
+- Витягування дати (великі літери, день тижня, звичайна дата)
+- Розбір інтервалів відключень по групах
+- Півгодинні межі та інтервали через північ
+- Швидкий відсів постів за датами на сьогодні/завтра
+"""
+
+import sys
+import unittest
+from datetime import date
+from pathlib import Path
+
+# Додаємо корінь проекту в шлях
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+try:
+    from src import dnipro_telegram_parser as parser
+except ImportError:  # Playwright не встановлено
+    parser = None
+
+
+def outages(day: dict) -> dict:
+    """Лише години з відключенням: {ключ години: стан}"""
+    return {key: state for key, state in day.items() if state != "yes"}
+
+
+@unittest.skipIf(parser is None, "Playwright не встановлено")
+class ExtractDateTest(unittest.TestCase):
+    """Тести extract_date_from_post"""
+
+    def test_caps(self):
+        text = "ГРАФІКИ ПОГОДИННИХ ВІДКЛЮЧЕНЬ НА 19 ГРУДНЯ"
+        self.assertEqual(parser.extract_date_from_post(text, year=2025), "19.12.2025")
+
+    def test_day_of_week(self):
+        text = "Завтра, у пʼятницю, 5 грудня, застосовуватимуться відключення"
+        self.assertEqual(parser.extract_date_from_post(text, year=2025), "05.12.2025")
+
+    def test_plain_date(self):
+        text = "Графік на 3 січня"
+        self.assertEqual(parser.extract_date_from_post(text, year=2026), "03.01.2026")
+
+    def test_first_date_wins(self):
+        text = "19 грудня та 20 грудня"
+        self.assertEqual(parser.extract_date_from_post(text, year=2025), "19.12.2025")
+
+    def test_no_date(self):
+        self.assertIsNone(parser.extract_date_from_post("Графік без дати", year=2025))
+
+
+@unittest.skipIf(parser is None, "Playwright не встановлено")
+class ParseScheduleTest(unittest.TestCase):
+    """Тести parse_schedule_from_text та put_interval"""
+
+    def test_whole_hours(self):
+        result = parser.parse_schedule_from_text("📌 1.1 черга: з 08:00 до 10:00")
+        self.assertEqual(outages(result["GPV1.1"]), {"9": "no", "10": "no"})
+
+    def test_half_hour_edges(self):
+        result = parser.parse_schedule_from_text(
+            "📌 1.1 черга: з 00:00 до 02:30\n"
+            "📌 1.2 черга: з 10:30 до 12:00"
+        )
+        self.assertEqual(outages(result["GPV1.1"]), {"1": "no", "2": "no", "3": "first"})
+        self.assertEqual(outages(result["GPV1.2"]), {"11": "second", "12": "no"})
+
+    def test_midnight_crossing(self):
+        result = parser.parse_schedule_from_text("📌 2.1 черга: з 23:30 до 01:00")
+        self.assertEqual(outages(result["GPV2.1"]), {"24": "second", "1": "no"})
+
+    def test_warning_ends_last_group(self):
+        result = parser.parse_schedule_from_text(
+            "📌 2.2 черги: з 08:00 до 09:00\n"
+            "Попереджаємо: з 10:00 до 11:00 можливі зміни"
+        )
+        self.assertEqual(outages(result["GPV2.2"]), {"9": "no"})
+
+    def test_full_day_defaults_to_yes(self):
+        result = parser.parse_schedule_from_text("📌 3.1 черга: відключень немає")
+        self.assertEqual(len(result["GPV3.1"]), 24)
+        self.assertEqual(outages(result["GPV3.1"]), {})
+
+    def test_no_groups(self):
+        self.assertEqual(parser.parse_schedule_from_text("Просто новина"), {})
+
+
+@unittest.skipIf(parser is None, "Playwright не встановлено")
+class TargetDatesTest(unittest.TestCase):
+    """Тести compile_target_dates_re"""
+
+    def setUp(self):
+        self.target_re = parser.compile_target_dates_re(date(2025, 12, 1), date(2025, 12, 2))
+
+    def test_today_and_tomorrow(self):
+        self.assertTrue(self.target_re.search("Графік на 1 грудня"))
+        self.assertTrue(self.target_re.search("ГРАФІКИ НА 2 ГРУДНЯ"))
+
+    def test_leading_zero(self):
+        self.assertTrue(self.target_re.search("Графік на 01 грудня"))
+
+    def test_other_day_with_same_digit(self):
+        self.assertIsNone(self.target_re.search("Графік на 11 грудня"))
+        self.assertIsNone(self.target_re.search("Графік на 21 грудня"))
+        self.assertIsNone(self.target_re.search("Графік на 12 грудня"))
+
+    def test_other_month(self):
+        self.assertIsNone(self.target_re.search("Графік на 1 січня"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Тести розбору імен згенерованих зображень
+
+Перевіряють:
+- Витягування дати з імені файлу в cleanup_old_images
+- Шаблони імен загального графіка та матриць груп у src.config
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Додаємо корінь проекту та scripts/ в шлях
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from src.config import (
+    compile_filename_pattern,
+    FULL_PATTERN, GROUPS_TODAY_PATTERN, GROUPS_TOMORROW_PATTERN,
+)
+from cleanup_old_images import extract_date_from_filename
+
+
+class ExtractDateFromFilenameTest(unittest.TestCase):
+    """Тести extract_date_from_filename"""
+
+    def test_standard_name(self):
+        self.assertEqual(extract_date_from_filename("gpv-full-20251201-120000.png"), "20251201")
+
+    def test_group_name(self):
+        self.assertEqual(
+            extract_date_from_filename("gpv-1-1-emergency-20251231-235959.png"), "20251231"
+        )
+
+    def test_dark_suffix(self):
+        self.assertEqual(
+            extract_date_from_filename("gpv-full-20251201-120000-dark.png"), "20251201"
+        )
+
+    def test_no_date(self):
+        self.assertIsNone(extract_date_from_filename("gpv-full.png"))
+        self.assertIsNone(extract_date_from_filename("gpv-full-latest-000000.png"))
+
+
+class FilenamePatternTest(unittest.TestCase):
+    """Тести шаблонів імен зображень"""
+
+    def test_full(self):
+        self.assertTrue(FULL_PATTERN.match("gpv-full-20251201-120000.png"))
+        self.assertIsNone(FULL_PATTERN.match("gpv-all-groups-20251201-120000.png"))
+        self.assertIsNone(FULL_PATTERN.match("gpv-full-20251201-120000.jpg"))
+
+    def test_groups(self):
+        self.assertTrue(GROUPS_TODAY_PATTERN.match("gpv-all-groups-20251201-120000.png"))
+        self.assertTrue(GROUPS_TOMORROW_PATTERN.match("gpv-all-groups-tomorrow-20251201-120000.png"))
+        self.assertIsNone(GROUPS_TOMORROW_PATTERN.match("gpv-all-groups-20251201-120000.png"))
+
+    def test_group_pattern_is_cached(self):
+        pattern = "gpv-1-1-emergency-*.png"
+        self.assertIs(compile_filename_pattern(pattern), compile_filename_pattern(pattern))
+        self.assertTrue(compile_filename_pattern(pattern).match("gpv-1-1-emergency-20251201-120000.png"))
+        self.assertIsNone(compile_filename_pattern(pattern).match("gpv-1-2-emergency-20251201-120000.png"))
+
+
+if __name__ == "__main__":
+    unittest.main()